@@ -0,0 +1,19 @@
+import os
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = ROOT_DIR / 'locblog'
+
+
+def setup_django(database_path=None):
+    """Настраивает Django на отдельную базу, не трогая db.sqlite3 проекта."""
+    sys.path.insert(0, str(PROJECT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'locblog.settings')
+
+    import django
+    from django.conf import settings
+
+    if database_path is not None:
+        settings.DATABASES['default']['NAME'] = str(database_path)
+    django.setup()
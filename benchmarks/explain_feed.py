@@ -0,0 +1,131 @@
+"""Планы запросов ленты до и после миграции с индексами.
+
+    python benchmarks/explain_feed.py --posts 50000
+
+База создаётся во временном каталоге, накатывается до миграции без
+индексов, заполняется, затем план запросов снимается дважды: до и после
+миграций с индексами ленты. Для каждой ленты показаны оба шага загрузки:
+выборка id страницы и подгрузка постов по этим id.
+"""
+import argparse
+import random
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from common import setup_django
+
+BEFORE_MIGRATION = '0008_post_comment_count'
+AFTER_MIGRATION = '0010_covering_feed_indexes'
+
+
+def seed(posts, comments_per_post):
+    from django.contrib.auth import get_user_model
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Location, Post
+
+    rng = random.Random(0)
+    User = get_user_model()
+    users = User.objects.bulk_create(
+        User(username=f'user{i}') for i in range(50)
+    )
+    users = list(User.objects.all())
+    Category.objects.bulk_create(
+        Category(title=f'Категория {i}', slug=f'category-{i}',
+                 description='', is_published=i % 5 != 0)
+        for i in range(20)
+    )
+    categories = list(Category.objects.all())
+    Location.objects.bulk_create(Location(name=f'Место {i}')
+                                 for i in range(20))
+    locations = list(Location.objects.all())
+
+    now = timezone.now()
+    Post.objects.bulk_create((
+        Post(
+            title=f'Пост {i}',
+            text='Текст',
+            pub_date=now - timedelta(minutes=rng.randint(-10000, 10 ** 6)),
+            is_published=rng.random() > 0.05,
+            author=rng.choice(users),
+            category=rng.choice(categories),
+            location=rng.choice(locations),
+        ) for i in range(posts)
+    ), batch_size=5000)
+    post_ids = list(Post.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create((
+        Comment(text='Комментарий', post_id=rng.choice(post_ids),
+                author=rng.choice(users))
+        for _ in range(posts * comments_per_post)
+    ), batch_size=5000)
+
+
+def feed_queries():
+    from django.contrib.auth import get_user_model
+
+    from blog.models import Category, Post
+    from blog.utils import FEED_ORDERING, PostFeed
+
+    author = get_user_model().objects.first()
+    category = Category.objects.filter(is_published=True).first()
+    post = Post.objects.order_by('-comment_count').first()
+    feeds = {
+        'index': PostFeed(),
+        'category': PostFeed(category.posts),
+        'profile': PostFeed(author.posts, author=author),
+    }
+    queries = {}
+    for name, feed in feeds.items():
+        page = feed.posts.order_by(*FEED_ORDERING)[:11]
+        queries[f'{name}: id'] = page.values_list('pk', flat=True)
+        queries[f'{name}: hydrate'] = feed.joined(feed.page_ids(page))
+    queries['comments'] = post.comments.all()
+    return queries
+
+
+def explain_all():
+    plans = {}
+    for name, queryset in feed_queries().items():
+        started = time.perf_counter()
+        list(queryset)
+        elapsed = (time.perf_counter() - started) * 1000
+        plans[name] = (queryset.explain(), elapsed)
+    return plans
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--comments-per-post', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'explain.sqlite3')
+        from django.core.management import call_command
+        from django.db import connection
+
+        call_command('migrate', verbosity=0)
+        call_command('migrate', 'blog', BEFORE_MIGRATION, verbosity=0)
+        seed(args.posts, args.comments_per_post)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        before = explain_all()
+
+        call_command('migrate', 'blog', AFTER_MIGRATION, verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        after = explain_all()
+
+    for name in before:
+        print(f'== {name}')
+        for label, (plan, elapsed) in (('до', before[name]),
+                                       ('после', after[name])):
+            print(f'-- {label} ({elapsed:.2f} мс)')
+            print(plan)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,274 @@
+"""Замер HTTP-маршрутов блога на синтетической базе.
+
+    python benchmarks/http_bench.py --posts 20000 --output bench.json
+    python benchmarks/http_bench.py --baseline bench.json
+
+База создаётся во временном каталоге и заполняется командой blog_seed.
+Запросы идут в WSGI-приложение внутри процесса через django.test.Client.
+Для каждого сценария считаются перцентили задержки, число SQL-запросов и
+размер ответа. Результат сохраняется в JSON; с --baseline печатается
+сравнение с предыдущим прогоном.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import ROOT_DIR, setup_django
+
+PERCENTILES = (50, 95, 99)
+
+
+class Scenario:
+
+    def __init__(self, name, url, client, method='get', data=None):
+        self.name = name
+        self.url = url
+        self.client = client
+        self.method = method
+        self.data = data
+
+    def request(self):
+        if self.method == 'post':
+            data = self.data() if callable(self.data) else self.data
+            return self.client.post(self.url, data)
+        return self.client.get(self.url, self.data)
+
+
+def deep_cursor(feed, pages):
+    """Курсор страницы номер pages; если страниц меньше — последней."""
+    page = feed.paginator().first_page()
+    for _ in range(pages - 1):
+        if not page.has_next():
+            break
+        page = feed.paginator().page(page.next_cursor)
+    if page.has_next():
+        return page.next_cursor
+    print(f'В ленте меньше {pages} стр.: index_deep измеряет последнюю.',
+          file=sys.stderr)
+    return page.last_cursor
+
+
+def build_scenarios(deep_pages):
+    from django.db.models import Count, Q
+    from django.test import Client
+    from django.urls import reverse
+    from django.utils import timezone
+
+    from blog.models import Category, Comment, Post
+    from blog.utils import PostFeed
+
+    now = timezone.now()
+    hot_post = Post.objects.filter(
+        is_published=True, pub_date__lte=now, category__is_published=True,
+    ).order_by('-comment_count').first()
+    author = hot_post.author
+    category = Category.objects.filter(is_published=True).annotate(
+        total=Count('posts', filter=Q(posts__is_published=True))
+    ).order_by('-total').first()
+    comment = Comment.objects.filter(author=author).first() or (
+        Comment.objects.create(post=hot_post, author=author, text='Текст')
+    )
+
+    anonymous = Client()
+    logged_in = Client()
+    logged_in.force_login(author)
+
+    def post_data():
+        return {
+            'title': 'Новый пост',
+            'text': 'Текст нового поста',
+            'pub_date': now.strftime('%Y-%m-%d %H:%M'),
+            'category': category.pk,
+            'is_published': 'on',
+        }
+
+    detail = reverse('blog:post_detail', args=(hot_post.pk,))
+    edit_comment = reverse(
+        'blog:edit_comment', args=(comment.post_id, comment.pk)
+    )
+    scenarios = [
+        Scenario('index', reverse('blog:index'), anonymous),
+        Scenario('index_auth', reverse('blog:index'), logged_in),
+        Scenario('index_deep', reverse('blog:index'), anonymous,
+                 data={'cursor': deep_cursor(PostFeed(), deep_pages)}),
+        Scenario('index_last', reverse('blog:index'), anonymous,
+                 data={'cursor': PostFeed().paginator().first_page()
+                       .last_cursor}),
+        Scenario('category_posts', reverse(
+            'blog:category_posts', args=(category.slug,)
+        ), anonymous),
+        Scenario('profile', reverse(
+            'blog:profile', args=(author.username,)
+        ), anonymous),
+        Scenario('profile_own', reverse(
+            'blog:profile', args=(author.username,)
+        ), logged_in),
+        Scenario('post_detail_hot', detail, anonymous),
+        Scenario('post_detail_hot_auth', detail, logged_in),
+        Scenario('search', reverse('blog:search'), anonymous,
+                 data={'q': hot_post.title.split()[0]}),
+        Scenario('create_post_form', reverse('blog:create_post'),
+                 logged_in),
+        Scenario('create_post', reverse('blog:create_post'), logged_in,
+                 method='post', data=post_data),
+        Scenario('edit_post', reverse(
+            'blog:edit_post', args=(hot_post.pk,)
+        ), logged_in, method='post', data=post_data),
+        Scenario('add_comment', reverse(
+            'blog:add_comment', args=(hot_post.pk,)
+        ), logged_in, method='post', data={'text': 'Комментарий'}),
+        Scenario('edit_comment', edit_comment, logged_in, method='post',
+                 data={'text': 'Исправленный комментарий'}),
+        Scenario('edit_profile', reverse('blog:edit_profile'), logged_in),
+        Scenario('about', reverse('pages:about'), anonymous),
+        Scenario('rules', reverse('pages:rules'), anonymous),
+        Scenario('not_found', '/posts/0/', anonymous),
+    ]
+    return scenarios
+
+
+def percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[
+        percent - 1
+    ]
+
+
+def run_scenario(scenario, requests, warmup, cold):
+    from django.core.cache import caches
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    def clear_caches():
+        if cold:
+            for cache in caches.all():
+                cache.clear()
+
+    for _ in range(warmup):
+        clear_caches()
+        scenario.request()
+
+    timings = []
+    queries = []
+    sizes = []
+    statuses = set()
+    for _ in range(requests):
+        clear_caches()
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = scenario.request()
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(len(captured))
+        sizes.append(len(response.content))
+        statuses.add(response.status_code)
+
+    result = {
+        f'p{percent}_ms': round(percentile(timings, percent), 3)
+        for percent in PERCENTILES
+    }
+    result.update(
+        mean_ms=round(statistics.mean(timings), 3),
+        queries=max(queries),
+        bytes=max(sizes),
+        status=sorted(statuses),
+    )
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ('git', 'rev-parse', '--short', 'HEAD'), cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_comparison(results, baseline):
+    print(f'{"сценарий":<22}{"p50 мс":>20}{"p95 мс":>20}{"запросы":>12}')
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            print(f'{name:<22}{current["p50_ms"]:>20}{current["p95_ms"]:>20}'
+                  f'{current["queries"]:>12}')
+            continue
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'queries'):
+            delta = current[key] - previous[key]
+            cells.append(f'{current[key]:g} ({delta:+g})')
+        print(f'{name:<22}{cells[0]:>20}{cells[1]:>20}{cells[2]:>12}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--hot-comments', type=int, default=1000)
+    parser.add_argument('--deep-pages', type=int, default=100)
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--cold', action='store_true',
+        help='Очищать кеши перед каждым запросом.',
+    )
+    parser.add_argument('--only', nargs='*', help='Запустить только эти'
+                        ' сценарии.')
+    parser.add_argument('--output', type=Path)
+    parser.add_argument('--baseline', type=Path)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        setup_django(Path(tmp_dir) / 'bench.sqlite3')
+        from django.conf import settings
+        from django.core.management import call_command
+
+        settings.DEBUG = False
+        settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+        settings.MEDIA_ROOT = Path(tmp_dir) / 'media'
+
+        call_command('migrate', verbosity=0)
+        call_command(
+            'blog_seed', posts=args.posts, users=args.users,
+            hot_comments=args.hot_comments, seed=args.seed,
+            stdout=sys.stderr,
+        )
+
+        results = {}
+        for scenario in build_scenarios(args.deep_pages):
+            if args.only and scenario.name not in args.only:
+                continue
+            results[scenario.name] = run_scenario(
+                scenario, args.requests, args.warmup, args.cold
+            )
+            print(scenario.name, results[scenario.name], file=sys.stderr)
+
+    report = {
+        'revision': git_revision(),
+        'options': {
+            key: value for key, value in vars(args).items()
+            if key not in ('output', 'baseline')
+        },
+        'results': results,
+    }
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding='utf-8',
+        )
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+        print_comparison(results, baseline['results'])
+    elif not args.output:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""Пропускная способность SQLite при одновременных чтении и записи.
+
+    python benchmarks/sqlite_concurrency.py --readers 4 --writers 2
+
+База заполняется командой blog_seed один раз и копируется для каждого
+режима. В режиме «до» соединения работают с журналом отката (DELETE) и
+стандартными настройками SQLite, в режиме «после» — с PRAGMA из
+BLOG_SQLITE_PRAGMAS. Читатели в отдельных процессах загружают первую
+страницу ленты и комментарии случайного поста, писатели добавляют
+комментарии и посты. Для каждой роли печатаются операции в секунду,
+p95 задержки и число ошибок «database is locked».
+"""
+import argparse
+import json
+import multiprocessing
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from common import setup_django
+
+MODES = {
+    'до': {'journal_mode': 'DELETE'},
+    'после': None,
+}
+
+
+def read_once(rng, post_ids):
+    from blog.models import Comment
+    from blog.utils import PostFeed
+
+    list(PostFeed().paginator().first_page())
+    list(Comment.objects.filter(
+        post_id=rng.choice(post_ids)
+    ).select_related('author')[:50])
+
+
+def write_once(rng, post_ids, author_ids, category_ids):
+    from django.utils import timezone
+
+    from blog.models import Comment, Post
+
+    if rng.random() < 0.1:
+        Post.objects.create(
+            title='Новый пост', text='Текст нового поста',
+            pub_date=timezone.now(), author_id=rng.choice(author_ids),
+            category_id=rng.choice(category_ids),
+        )
+    else:
+        Comment.objects.create(
+            text='Комментарий', post_id=rng.choice(post_ids),
+            author_id=rng.choice(author_ids),
+        )
+
+
+def worker(role, number, database_path, pragmas, duration, barrier,
+           results):
+    setup_django(database_path)
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.db import OperationalError, connection
+
+    from blog.models import Category, Post
+
+    if pragmas is not None:
+        settings.BLOG_SQLITE_PRAGMAS = pragmas
+    rng = random.Random(number)
+    post_ids = list(Post.objects.values_list('pk', flat=True))
+    author_ids = list(get_user_model().objects.values_list('pk', flat=True))
+    category_ids = list(Category.objects.values_list('pk', flat=True))
+
+    timings = []
+    errors = 0
+    barrier.wait()
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if role == 'reader':
+                read_once(rng, post_ids)
+            else:
+                write_once(rng, post_ids, author_ids, category_ids)
+        except OperationalError:
+            errors += 1
+            continue
+        timings.append((time.perf_counter() - started) * 1000)
+    connection.close()
+    results.put((role, timings, errors))
+
+
+def run_mode(database_path, pragmas, args):
+    context = multiprocessing.get_context('spawn')
+    roles = ['reader'] * args.readers + ['writer'] * args.writers
+    barrier = context.Barrier(len(roles))
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(
+            role, number, database_path, pragmas, args.duration, barrier,
+            results,
+        ))
+        for number, role in enumerate(roles)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    summary = {}
+    for role in ('reader', 'writer'):
+        timings = [
+            value for name, values, _ in collected if name == role
+            for value in values
+        ]
+        summary[role] = {
+            'ops_per_s': round(len(timings) / args.duration, 1),
+            'p95_ms': round(
+                statistics.quantiles(timings, n=20)[-1], 3
+            ) if len(timings) > 1 else None,
+            'errors': sum(
+                errors for name, _, errors in collected if name == role
+            ),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--writers', type=int, default=2)
+    parser.add_argument(
+        '--duration', type=float, default=10,
+        help='Длительность замера в каждом режиме, секунды.',
+    )
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seeded = Path(tmp_dir) / 'seeded.sqlite3'
+        setup_django(seeded)
+        from django.conf import settings
+        from django.core.management import call_command
+        from django.db import connections
+
+        settings.BLOG_SQLITE_PRAGMAS = MODES['до']
+        call_command('migrate', verbosity=0)
+        call_command(
+            'blog_seed', posts=args.posts, users=args.users, seed=args.seed,
+            stdout=sys.stderr,
+        )
+        connections.close_all()
+
+        report = {}
+        for mode, pragmas in MODES.items():
+            database_path = Path(tmp_dir) / f'{len(report)}.sqlite3'
+            shutil.copy(seeded, database_path)
+            report[mode] = run_mode(database_path, pragmas, args)
+            print(mode, report[mode], file=sys.stderr)
+
+    print(f'{"режим":<8}{"роль":<8}{"оп/с":>10}{"p95 мс":>12}{"ошибки":>9}')
+    for mode, summary in report.items():
+        for role, values in summary.items():
+            print(f'{mode:<8}{role:<8}{values["ops_per_s"]:>10}'
+                  f'{values["p95_ms"]!s:>12}{values["errors"]:>9}')
+    if args.output:
+        args.output.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2),
+            encoding='utf-8',
+        )
+
+
+if __name__ == '__main__':
+    main()
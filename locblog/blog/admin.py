@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Category, Comment, Location, Post
+from .jobs import enqueue_derivatives
+from .models import Category, Comment, ImageJob, Location, Post
+from .search import search_condition
 
 
 @admin.register(Category)
@@ -20,7 +22,23 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('title', 'text')
     list_filter = ('is_published',)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.filter(search_condition(search_term)), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if 'image' in form.changed_data:
+            enqueue_derivatives(obj)
+
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
     search_fields = ('text', 'author')
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('image', 'status', 'created_at', 'started_at')
+    list_filter = ('status',)
@@ -0,0 +1,131 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_safe
+
+from .cache import cache_anonymous_page
+from .conditional import condition_on_content
+from .models import Category, Comment, Post
+from .utils import (COUNT_NONE, PostFeed, get_current_date,
+                    paginate_comments)
+
+API_POST_FIELDS = (
+    'id', 'title', 'text', 'pub_date', 'image', 'comment_count',
+    'author__username', 'category__slug', 'category__title',
+    'location__name', 'location__is_published',
+)
+API_COMMENT_FIELDS = ('id', 'text', 'created_at', 'author__username')
+
+
+def serialize_post(row):
+    return {
+        'id': row['id'],
+        'title': row['title'],
+        'text': row['text'],
+        'pub_date': row['pub_date'],
+        'author': row['author__username'],
+        'category': {
+            'slug': row['category__slug'],
+            'title': row['category__title'],
+        } if row['category__slug'] else None,
+        'location': (
+            row['location__name'] if row['location__is_published'] else None
+        ),
+        'image': (
+            default_storage.url(row['image']) if row['image'] else None
+        ),
+        'comment_count': row['comment_count'],
+    }
+
+
+def serialize_comment(row):
+    return {
+        'id': row['id'],
+        'author': row['author__username'],
+        'text': row['text'],
+        'created_at': row['created_at'],
+    }
+
+
+class ApiPostFeed(PostFeed):
+    """Лента API: вторым шагом читает строки values(), а не модели."""
+
+    def hydrate(self, page):
+        ids = self.page_ids(page)
+        rows = {
+            row['id']: row
+            for row in Post.objects.filter(pk__in=ids).order_by().values(
+                *API_POST_FIELDS
+            )
+        }
+        return [serialize_post(rows[pk]) for pk in ids if pk in rows]
+
+
+def feed_response(request, feed):
+    page = feed.paginator(count_mode=COUNT_NONE).get_page(
+        request.GET.get('cursor')
+    )
+    return JsonResponse({
+        'results': list(page),
+        'next': page.next_cursor,
+        'previous': page.previous_cursor,
+    })
+
+
+@require_safe
+@condition_on_content
+@cache_anonymous_page
+def post_list(request):
+    return feed_response(request, ApiPostFeed())
+
+
+@require_safe
+@condition_on_content
+@cache_anonymous_page
+def category_post_list(request, category_slug):
+    category = get_object_or_404(
+        Category,
+        slug=category_slug,
+        is_published=True
+    )
+    return feed_response(request, ApiPostFeed(category.posts))
+
+
+@require_safe
+@condition_on_content
+@cache_anonymous_page
+def profile_post_list(request, username):
+    user = get_object_or_404(get_user_model(), username=username)
+    author = user if request.user == user else None
+    return feed_response(request, ApiPostFeed(user.posts, author=author))
+
+
+@require_safe
+@condition_on_content
+def post_detail(request, post_id):
+    row = Post.objects.filter(pk=post_id).values(
+        *API_POST_FIELDS, 'is_published', 'category__is_published',
+        'author_id',
+    ).first()
+    if row is None:
+        raise Http404()
+    if (
+            (
+                not row['is_published']
+                or row['pub_date'] > get_current_date()
+                or not row['category__is_published']
+            )
+            and row['author_id'] != request.user.pk
+    ):
+        raise Http404()
+
+    comments = paginate_comments(
+        Comment.objects.filter(post_id=post_id).values(*API_COMMENT_FIELDS),
+        request.GET.get('cursor'),
+    )
+    return JsonResponse({
+        'post': serialize_post(row),
+        'comments': [serialize_comment(comment) for comment in comments],
+        'next': comments.next_cursor,
+    })
@@ -0,0 +1,20 @@
+from django.urls import path
+
+from . import api
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', api.post_list, name='post_list'),
+    path('posts/<int:post_id>/', api.post_detail, name='post_detail'),
+    path(
+        'category/<slug:category_slug>/posts/',
+        api.category_post_list,
+        name='category_post_list'
+    ),
+    path(
+        'profile/<str:username>/posts/',
+        api.profile_post_list,
+        name='profile_post_list'
+    ),
+]
@@ -0,0 +1,52 @@
+from contextlib import contextmanager
+
+from django.db.models import Max
+
+from .cache import invalidate_all
+from .feeds import clear_feeds
+from .search import rebuild_search_index
+from .utils import recount_comments
+
+# Поле, по которому выгрузка ссылается на строку, а загрузка находит её
+# среди уже существующих: ключи в разных базах не совпадают.
+NATURAL_KEYS = {
+    'auth.user': 'username',
+    'blog.category': 'slug',
+    'blog.location': 'name',
+}
+
+
+def next_pk(model):
+    """Первый свободный id: bulk_create в SQLite не возвращает ключи."""
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+@contextmanager
+def preserve_auto_now_add(*models):
+    """Отключает auto_now_add, чтобы bulk_create сохранил исходные даты."""
+    fields = [
+        field
+        for model in models
+        for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def finish_bulk_load(posts):
+    """Догоняет то, что при сохранении по одной строке делают сигналы.
+
+    bulk_create не отправляет post_save, поэтому после массовой загрузки
+    нужно пересчитать счётчики комментариев, перестроить поисковый индекс
+    и сбросить кеши отрисованных карточек и страниц и готовые ленты RSS.
+    """
+    recount_comments(posts)
+    rebuild_search_index()
+    invalidate_all()
+    clear_feeds()
@@ -0,0 +1,255 @@
+import hashlib
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Min
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.safestring import mark_safe
+
+from .replicas import (current_replica, read_from_primary,
+                       reading_from_replica)
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+POST_CARD_TEMPLATE = 'includes/post_card.html'
+
+PAGE_CACHE_TIMEOUT = 60 * 5
+PAGE_CACHE_HEADER = 'X-Page-Cache'
+PAGE_CACHE_HITS = 'page-cache:hits'
+PAGE_CACHE_MISSES = 'page-cache:misses'
+CONTENT_SCOPE = ('content', 'all')
+
+
+def get_fragment_cache():
+    return caches[getattr(settings, 'BLOG_FRAGMENT_CACHE', 'default')]
+
+
+def _version_key(scope, pk):
+    return f'version:{scope}:{pk}'
+
+
+def get_page_cache():
+    return caches[getattr(settings, 'BLOG_PAGE_CACHE', 'default')]
+
+
+def bump_version(scope, pk):
+    # Любое изменение содержимого заодно сбрасывает общую метку, от которой
+    # зависят ключи закешированных страниц.
+    get_fragment_cache().set_many({
+        _version_key(scope, pk): uuid4().hex,
+        _version_key(*CONTENT_SCOPE): uuid4().hex,
+    }, None)
+
+
+def _replica_sync_key(alias):
+    return f'replica-sync:{alias}'
+
+
+def mark_replica_synced(alias):
+    """Запоминает, что реплика получила свежую копию основной базы."""
+    get_fragment_cache().set(
+        _replica_sync_key(alias), (uuid4().hex, timezone.now()), None
+    )
+
+
+def replica_sync_state():
+    """Метка и время последней синхронизации реплики текущего запроса.
+
+    None, если запрос читает с основной базы или реплика ещё не сообщала о
+    синхронизации (например, после очистки кеша) и её отставание неизвестно.
+    """
+    alias = current_replica()
+    if alias is None:
+        return None
+    return get_fragment_cache().get(_replica_sync_key(alias))
+
+
+def invalidate_all():
+    get_fragment_cache().clear()
+    get_page_cache().clear()
+
+
+def get_versions(*scoped_ids):
+    """Возвращает метки версий для пар (scope, pk) одним обращением к кешу.
+
+    Отсутствующая метка (кеш очищен или вытеснен) заменяется новой, поэтому
+    фрагменты, собранные до потери метки, больше не будут прочитаны.
+    """
+    fragment_cache = get_fragment_cache()
+    keys = [_version_key(scope, pk) for scope, pk in scoped_ids]
+    versions = fragment_cache.get_many(keys)
+    missing = {key: uuid4().hex for key in keys if key not in versions}
+    if missing:
+        fragment_cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def _sync_stamp():
+    """Часть ключа кеша, отделяющая данные реплики от основной базы.
+
+    Реплика может отставать от меток версий, поэтому собранное из её
+    данных хранится под меткой её последней синхронизации: такие записи
+    не видны запросам к основной базе и устаревают со следующей
+    синхронизацией. Для реплики с неизвестной синхронизацией — None.
+    """
+    if not reading_from_replica():
+        return 'primary'
+    sync_state = replica_sync_state()
+    return None if sync_state is None else sync_state[0]
+
+
+def post_card_key(post, sync_stamp='primary'):
+    versions = get_versions(
+        ('post', post.pk),
+        ('category', post.category_id),
+        ('location', post.location_id),
+        ('user', post.author_id),
+    )
+    return f'post-card:{post.pk}:{":".join(versions)}:{sync_stamp}'
+
+
+def render_post_card(post):
+    fragment_cache = get_fragment_cache()
+    sync_stamp = _sync_stamp()
+    key = post_card_key(post, sync_stamp)
+    html = fragment_cache.get(key)
+    if html is None:
+        html = render_to_string(POST_CARD_TEMPLATE, {'post': post})
+        if sync_stamp is not None:
+            fragment_cache.set(key, html, FRAGMENT_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def _count(key):
+    page_cache = get_page_cache()
+    page_cache.add(key, 0, None)
+    try:
+        page_cache.incr(key)
+    except ValueError:
+        pass
+
+
+def page_cache_stats():
+    stats = get_page_cache().get_many([PAGE_CACHE_HITS, PAGE_CACHE_MISSES])
+    return {
+        'hits': stats.get(PAGE_CACHE_HITS, 0),
+        'misses': stats.get(PAGE_CACHE_MISSES, 0),
+    }
+
+
+def page_cache_key(request):
+    content_version, = get_versions(CONTENT_SCOPE)
+    url = f'{request.get_host()}{request.get_full_path()}'
+    url_hash = hashlib.md5(url.encode()).hexdigest()
+    return f'page:{content_version}:{_sync_stamp()}:{url_hash}'
+
+
+def _next_pub_date(now):
+    from .models import Post
+
+    # Состояние кешируется под меткой содержимого, поэтому читается с
+    # основной базы, а не с отстающей реплики.
+    return Post.objects.using(DEFAULT_DB_ALIAS).filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=now,
+    ).aggregate(next_pub_date=Min('pub_date'))['next_pub_date']
+
+
+def content_state():
+    """Метка содержимого, ближайшая отложенная публикация и время изменения.
+
+    Состояние хранится в кеше под текущей меткой содержимого до ближайшей
+    отложенной публикации. Правка данных меняет метку, наступление
+    публикации удаляет запись; в обоих случаях время изменения обновляется,
+    а запрос к базе выполняется один раз, а не на каждый запрос страницы.
+    """
+    content_version, = get_versions(CONTENT_SCOPE)
+    fragment_cache = get_fragment_cache()
+    key = f'content-state:{content_version}'
+    state = fragment_cache.get(key)
+    now = timezone.now()
+    if state is None or (state[0] is not None and state[0] <= now):
+        state = (_next_pub_date(now), now)
+        timeout = (
+            int((state[0] - now).total_seconds()) + 1
+            if state[0] is not None else None
+        )
+        fragment_cache.set(key, state, timeout)
+    next_pub_date, modified = state
+    return content_version, next_pub_date, modified
+
+
+def page_cache_timeout():
+    _, next_pub_date, _ = content_state()
+    timeout = getattr(settings, 'BLOG_PAGE_CACHE_TIMEOUT', PAGE_CACHE_TIMEOUT)
+    if next_pub_date is not None:
+        timeout = min(timeout, int(
+            (next_pub_date - timezone.now()).total_seconds()
+        ))
+    return timeout
+
+
+def _is_cacheable(response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+    )
+
+
+def cache_anonymous_page(view):
+    """Кеширует страницу целиком для анонимных GET-запросов.
+
+    Ключ зависит от общей метки содержимого, а время жизни не превышает
+    интервала до ближайшей отложенной публикации. Авторизованные
+    пользователи видят другую шапку и кнопки, поэтому всегда обходят кеш.
+
+    Страницы с реплики кешируются под меткой её синхронизации: после
+    правки посетители реплики до следующей синхронизации видят прежнюю
+    версию, зато промахи кеша не нагружают основную базу. Если о
+    синхронизации реплики ничего не известно, промах читается с основной
+    базы и кешируется вместе с её страницами.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        if request.user.is_authenticated:
+            response = view(request, *args, **kwargs)
+            response[PAGE_CACHE_HEADER] = 'BYPASS'
+            return response
+
+        if reading_from_replica() and replica_sync_state() is None:
+            read_from_primary()
+        page_cache = get_page_cache()
+        key = page_cache_key(request)
+        cached = page_cache.get(key)
+        if cached is not None:
+            _count(PAGE_CACHE_HITS)
+            status, content, headers = cached
+            response = HttpResponse(content, status=status)
+            for header, value in headers:
+                response[header] = value
+            response[PAGE_CACHE_HEADER] = 'HIT'
+            return response
+
+        _count(PAGE_CACHE_MISSES)
+        response = view(request, *args, **kwargs)
+        if _is_cacheable(response):
+            timeout = page_cache_timeout()
+            if timeout > 0:
+                page_cache.set(key, (
+                    response.status_code,
+                    response.content,
+                    list(response.items()),
+                ), timeout)
+        response[PAGE_CACHE_HEADER] = 'MISS'
+        return response
+
+    return wrapper
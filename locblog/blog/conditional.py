@@ -0,0 +1,59 @@
+import hashlib
+
+from django.views.decorators.http import condition
+
+from .cache import content_state, replica_sync_state
+from .replicas import reading_from_replica
+
+VALIDATORS_ATTR = '_blog_validators'
+NO_VALIDATORS = (None, None)
+
+
+def _validators(request):
+    validators = getattr(request, VALIDATORS_ATTR, None)
+    if validators is not None:
+        return validators
+
+    content_version, _, modified = content_state()
+    sync_stamp = ''
+    if reading_from_replica():
+        sync_state = replica_sync_state()
+        if sync_state is None:
+            # Неизвестно, насколько реплика отстаёт от метки содержимого:
+            # с такими валидаторами клиент закрепил бы устаревший ответ.
+            setattr(request, VALIDATORS_ATTR, NO_VALIDATORS)
+            return NO_VALIDATORS
+        sync_stamp, synced_at = sync_state
+        modified = max(modified, synced_at)
+    viewer = request.user.pk if request.user.is_authenticated else 'anon'
+    fingerprint = ':'.join(str(part) for part in (
+        content_version,
+        sync_stamp,
+        viewer,
+        request.get_full_path(),
+        modified.timestamp(),
+    ))
+    validators = (hashlib.md5(fingerprint.encode()).hexdigest(), modified)
+    setattr(request, VALIDATORS_ATTR, validators)
+    return validators
+
+
+def condition_on_content(view):
+    """Отвечает 304, если содержимое блога не менялось.
+
+    ETag и Last-Modified берутся из общей метки содержимого и времени её
+    смены (см. cache.content_state), без запросов к базе: любая правка,
+    удаление или наступление отложенной публикации их обновляет. ETag
+    учитывает ещё адрес и посетителя.
+
+    Ответ с реплики собран из её копии данных, а не из основной базы,
+    поэтому валидаторы учитывают и её последнюю синхронизацию. Для реплики,
+    о синхронизации которой ничего не известно, валидаторы не выдаются.
+    """
+    def etag(request, *args, **kwargs):
+        return _validators(request)[0]
+
+    def last_modified(request, *args, **kwargs):
+        return _validators(request)[1]
+
+    return condition(etag_func=etag, last_modified_func=last_modified)(view)
@@ -0,0 +1,223 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.db.models import Min
+from django.http import Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed, Rss201rev2Feed
+from django.utils.http import http_date
+
+from .models import Category, Post
+from .utils import FEED_ORDERING, FEED_RELATED, filter_posts
+
+FEED_SIZE = 20
+FEED_FORMATS = {'rss': Rss201rev2Feed, 'atom': Atom1Feed}
+GLOBAL_SCOPE = 'all'
+
+
+def site_url(path):
+    # Лента одна на всех посетителей, поэтому ссылки в ней строятся от
+    # настроенного адреса сайта, а не от Host первого запроса.
+    return f'{settings.BLOG_SITE_URL.rstrip("/")}{path}'
+
+
+class PostsFeed(Feed):
+    title = 'Блогикум: новые публикации'
+    description = 'Последние публикации всех авторов.'
+
+    def __init__(self, feed_format='rss'):
+        self.feed_format = feed_format
+        self.feed_type = FEED_FORMATS[feed_format]
+
+    def link(self, obj=None):
+        return site_url(reverse('blog:index'))
+
+    def feed_url(self, obj=None):
+        return site_url(reverse('blog:posts_feed', args=(self.feed_format,)))
+
+    def posts(self, obj):
+        return Post.objects.all()
+
+    def items(self, obj=None):
+        return filter_posts(self.posts(obj)).select_related(
+            *FEED_RELATED
+        ).order_by(*FEED_ORDERING)[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.text
+
+    def item_link(self, item):
+        return site_url(reverse('blog:post_detail', args=(item.pk,)))
+
+    def item_pubdate(self, item):
+        return item.pub_date
+
+    def item_author_name(self, item):
+        return item.author.get_username()
+
+    def item_categories(self, item):
+        return [item.category.title] if item.category else []
+
+
+class CategoryPostsFeed(PostsFeed):
+
+    def get_object(self, request, category_slug):
+        return get_object_or_404(
+            Category, slug=category_slug, is_published=True
+        )
+
+    def title(self, obj):
+        return f'Блогикум: {obj.title}'
+
+    def description(self, obj):
+        return obj.description
+
+    def link(self, obj):
+        return site_url(reverse('blog:category_posts', args=(obj.slug,)))
+
+    def feed_url(self, obj):
+        return site_url(reverse(
+            'blog:category_feed', args=(obj.slug, self.feed_format)
+        ))
+
+    def posts(self, obj):
+        return obj.posts.all()
+
+
+class AuthorPostsFeed(PostsFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(get_user_model(), username=username)
+
+    def title(self, obj):
+        return f'Блогикум: публикации @{obj.get_username()}'
+
+    def description(self, obj):
+        return f'Последние публикации пользователя @{obj.get_username()}.'
+
+    def link(self, obj):
+        return site_url(reverse('blog:profile', args=(obj.get_username(),)))
+
+    def feed_url(self, obj):
+        return site_url(reverse(
+            'blog:author_feed', args=(obj.get_username(), self.feed_format)
+        ))
+
+    def posts(self, obj):
+        return obj.posts.all()
+
+
+def feeds_root():
+    return Path(settings.BLOG_FEEDS_ROOT)
+
+
+def category_scope(slug):
+    return f'category/{slug}'
+
+
+def author_scope(username):
+    # Имя пользователя может содержать точки, поэтому в путь идёт хеш.
+    return f'author/{hashlib.md5(username.encode()).hexdigest()}'
+
+
+def _write_atomic(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent)
+    with os.fdopen(fd, 'wb') as fp:
+        fp.write(content)
+    os.replace(tmp_name, path)
+
+
+def _next_pub_date(posts):
+    return posts.filter(
+        is_published=True,
+        category__is_published=True,
+        pub_date__gt=timezone.now(),
+    ).aggregate(next=Min('pub_date'))['next']
+
+
+def feed_path(scope, feed_format):
+    return feeds_root() / scope / f'{feed_format}.feed'
+
+
+def _read_feed(path):
+    """Метаданные и XML готовой ленты или None, если её нужно собрать.
+
+    Файл — строка JSON с метаданными и следом XML: он заменяется целиком,
+    поэтому ETag всегда соответствует телу.
+    """
+    try:
+        header, content = path.read_bytes().split(b'\n', 1)
+        meta = json.loads(header)
+    except (FileNotFoundError, ValueError):
+        return None
+    valid_until = meta.get('valid_until')
+    if valid_until and timezone.now() >= datetime.fromisoformat(valid_until):
+        return None
+    return meta, content
+
+
+def build_feed(request, scope, feed, kwargs):
+    """Рендерит ленту и сохраняет XML вместе с метаданными.
+
+    Метаданные хранят тип содержимого, ETag и момент ближайшей отложенной
+    публикации в ленте: после него файл считается устаревшим.
+    """
+    response = feed(request, **kwargs)
+    obj = feed.get_object(request, **kwargs)
+    next_pub_date = _next_pub_date(feed.posts(obj))
+    meta = {
+        'content_type': response['Content-Type'],
+        'etag': f'"{hashlib.md5(response.content).hexdigest()}"',
+        'last_modified': timezone.now().timestamp(),
+        'valid_until': next_pub_date and next_pub_date.isoformat(),
+    }
+    _write_atomic(
+        feed_path(scope, feed.feed_format),
+        json.dumps(meta).encode() + b'\n' + response.content,
+    )
+    return meta, response.content
+
+
+def serve_feed(request, scope, feed_format, feed_class, **kwargs):
+    if feed_format not in FEED_FORMATS:
+        raise Http404()
+
+    cached = _read_feed(feed_path(scope, feed_format))
+    if cached is None:
+        cached = build_feed(
+            request, scope, feed_class(feed_format), kwargs
+        )
+    info, content = cached
+
+    response = get_conditional_response(
+        request, etag=info['etag'], last_modified=int(info['last_modified'])
+    )
+    if response is None:
+        response = HttpResponse(content, content_type=info['content_type'])
+        response['ETag'] = info['etag']
+        response['Last-Modified'] = http_date(info['last_modified'])
+    return response
+
+
+def invalidate_feeds(*scopes):
+    for scope in scopes:
+        shutil.rmtree(feeds_root() / scope, ignore_errors=True)
+
+
+def clear_feeds():
+    shutil.rmtree(feeds_root(), ignore_errors=True)
@@ -0,0 +1,82 @@
+import os
+
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+# Расширение файла -> формат Pillow. AVIF сохраняется, только если Pillow
+# собран с его поддержкой (например, через pillow-avif-plugin).
+DERIVATIVE_FORMATS = (
+    ('avif', 'AVIF'),
+    ('webp', 'WEBP'),
+    ('jpg', 'JPEG'),
+)
+DERIVATIVE_QUALITY = 80
+FALLBACK_EXTENSION = 'jpg'
+MIME_TYPES = {
+    'avif': 'image/avif',
+    'webp': 'image/webp',
+    'jpg': 'image/jpeg',
+}
+
+
+def available_formats():
+    Image.init()
+    return [
+        (extension, pil_format)
+        for extension, pil_format in DERIVATIVE_FORMATS
+        if pil_format in Image.SAVE
+    ]
+
+
+def derivative_name(name, width, extension):
+    root, _ = os.path.splitext(name)
+    return f'{root}.{width}w.{extension}'
+
+
+def build_derivatives(source_path):
+    """Сохраняет уменьшенные копии изображения рядом с оригиналом.
+
+    Работает только с путями файловой системы и не обращается к Django,
+    поэтому её можно вызывать в отдельном процессе. Возвращает
+    {расширение: [ширина, ...]} созданных копий.
+    """
+    created = {}
+    with Image.open(source_path) as original:
+        image = ImageOps.exif_transpose(original).convert('RGB')
+    for width in THUMBNAIL_WIDTHS:
+        if width > image.width:
+            break
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        for extension, pil_format in available_formats():
+            path = derivative_name(source_path, width, extension)
+            resized.save(path, pil_format, quality=DERIVATIVE_QUALITY)
+            created.setdefault(extension, []).append(width)
+    return created
+
+
+def get_derivatives(image):
+    """Возвращает {расширение: [(url, ширина), ...]} для готовых копий.
+
+    Список копий записывает обработчик очереди в Post.image_derivatives,
+    поэтому отрисовка не проверяет файлы в хранилище.
+    """
+    derivatives = {}
+    if not image:
+        return derivatives
+    record = getattr(image.instance, 'image_derivatives', None) or {}
+    # Запись относится к прежнему файлу, если изображение уже заменили.
+    if record.get('image') != image.name:
+        return derivatives
+    for extension, widths in record['widths'].items():
+        derivatives[extension] = [
+            (
+                default_storage.url(
+                    derivative_name(image.name, width, extension)
+                ),
+                width,
+            )
+            for width in widths
+        ]
+    return derivatives
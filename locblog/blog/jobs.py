@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .cache import bump_version
+from .models import ImageJob, Post
+
+STALE_JOB_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_derivatives(post):
+    if not post.image:
+        return None
+    return ImageJob.objects.create(post=post, image=post.image.name)
+
+
+def requeue_stale_jobs():
+    return ImageJob.objects.filter(
+        status=ImageJob.RUNNING,
+        started_at__lt=timezone.now() - STALE_JOB_TIMEOUT,
+    ).update(status=ImageJob.PENDING, started_at=None)
+
+
+def claim_jobs(limit):
+    claimed = []
+    pending = ImageJob.objects.filter(
+        status=ImageJob.PENDING
+    ).values_list('pk', 'image')[:limit]
+    for pk, image in pending:
+        # Условное обновление — атомарный захват задачи: если её уже взял
+        # другой воркер, строка не совпадёт по статусу.
+        taken = ImageJob.objects.filter(
+            pk=pk, status=ImageJob.PENDING
+        ).update(status=ImageJob.RUNNING, started_at=timezone.now())
+        if taken:
+            claimed.append((pk, default_storage.path(image)))
+    return claimed
+
+
+def finish_job(pk, error='', derivatives=None):
+    ImageJob.objects.filter(pk=pk).update(
+        status=ImageJob.FAILED if error else ImageJob.DONE,
+        error=error,
+    )
+    if error:
+        return
+    job = ImageJob.objects.filter(pk=pk).values_list(
+        'post_id', 'image'
+    ).first()
+    if job is None or job[0] is None:
+        return
+    post_id, image = job
+    # Список копий сохраняется в посте, чтобы отрисовка не проверяла
+    # файлы в хранилище. Если изображение успели заменить, запись
+    # достанется задаче для нового файла.
+    Post.objects.filter(pk=post_id, image=image).update(
+        image_derivatives={'image': image, 'widths': derivatives or {}}
+    )
+    # Карточка и страницы поста закешированы без srcset: метка версии
+    # в общем кеше сбрасывает их во всех процессах.
+    bump_version('post', post_id)
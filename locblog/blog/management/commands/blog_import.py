@@ -0,0 +1,207 @@
+import time
+from collections import Counter, defaultdict
+from itertools import chain
+from pathlib import Path
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog.bulk import (NATURAL_KEYS, finish_bulk_load, next_pk,
+                       preserve_auto_now_add)
+from blog.models import Category, Comment, Location, Post
+from blog.streaming import iter_records
+
+# Порядок вставки при сбросе пачки: сначала строки, на которые ссылаются.
+IMPORT_ORDER = ('blog.category', 'blog.location', 'blog.post', 'blog.comment')
+USER_LABEL = 'auth.user'
+DEFAULT_BATCH_SIZE = 1000
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает категории, местоположения, публикации и'
+        ' комментарии из JSON- или JSONL-дампа (в том числе .gz) или из'
+        ' файлов blog_export.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths', nargs='+',
+            help='Файлы дампа; связи между ними сопоставляются в пределах'
+                 ' одного запуска.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Сколько строк вставлять в одной транзакции.',
+        )
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.id_maps = defaultdict(dict)
+        self.buffers = defaultdict(list)
+        self.buffered = 0
+        self.created = Counter()
+        self.skipped = Counter()
+        self.pending = []
+        self.next_pk = {
+            label: next_pk(apps.get_model(label)) for label in IMPORT_ORDER
+        }
+        self.natural_pks = defaultdict(dict)
+        first_post_pk = self.next_pk['blog.post']
+        paths = sorted(options['paths'], key=self._path_order)
+
+        started = time.monotonic()
+        self._import_users(paths)
+        with preserve_auto_now_add(Category, Location, Post, Comment):
+            for record in chain.from_iterable(map(iter_records, paths)):
+                self._add(record)
+            self._flush()
+            self._resolve_pending()
+        finish_bulk_load(Post.objects.filter(pk__gte=first_post_pk))
+        self._report(time.monotonic() - started)
+
+    @staticmethod
+    def _path_order(path):
+        # Файлы blog_export называются по модели: загружаем их в порядке
+        # IMPORT_ORDER, чтобы комментарии не ждали публикаций в очереди.
+        name = Path(path).name
+        for index, label in enumerate(IMPORT_ORDER):
+            if name.startswith(f'{label.replace(".", "_")}.'):
+                return index
+        return -1
+
+    def _natural_pk(self, label, key):
+        known = self.natural_pks[label]
+        if key not in known:
+            pk = apps.get_model(label).objects.filter(
+                **{NATURAL_KEYS[label]: key}
+            ).values_list('pk', flat=True).first()
+            if pk is None:
+                return None
+            known[key] = pk
+        return known[key]
+
+    def _resolve_pending(self):
+        # Ссылки вперёд могут образовывать цепочки (комментарий -> пост ->
+        # категория), поэтому повторяем, пока очередь сокращается.
+        while self.pending:
+            pending, self.pending = self.pending, []
+            for record in pending:
+                self._add(record)
+            self._flush()
+            if len(self.pending) == len(pending):
+                break
+        for record in self.pending:
+            label = record['model'].lower()
+            self.skipped[f'{label} (нет связанной записи)'] += 1
+        self.pending = []
+
+    def _import_users(self, paths):
+        usernames = {}
+        new_users = []
+        for record in chain.from_iterable(map(iter_records, paths)):
+            if record['model'].lower() != USER_LABEL:
+                continue
+            fields = record['fields']
+            usernames[fields['username']] = record['pk']
+            new_users.append(User(**{
+                name: User._meta.get_field(name).to_python(value)
+                for name, value in fields.items()
+                if not User._meta.get_field(name).many_to_many
+            }))
+        existing = set(User.objects.filter(
+            username__in=usernames
+        ).values_list('username', flat=True))
+        User.objects.bulk_create(
+            [user for user in new_users if user.username not in existing],
+            batch_size=self.batch_size,
+        )
+        self.created[USER_LABEL] = len(new_users) - len(existing)
+        for username, pk in User.objects.filter(
+            username__in=usernames
+        ).values_list('username', 'pk'):
+            self.id_maps[USER_LABEL][usernames[username]] = pk
+
+    def _build(self, model, record):
+        values = {}
+        for name, value in record['fields'].items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_many or not field.concrete:
+                continue
+            if field.is_relation and value is not None:
+                related = field.related_model._meta.label_lower
+                if isinstance(value, list):
+                    target = self._natural_pk(related, *value)
+                else:
+                    target = self.id_maps[related].get(value)
+                if target is None:
+                    return None
+                values[field.attname] = target
+            else:
+                values[field.attname] = field.to_python(value)
+        return model(**values)
+
+    def _add(self, record):
+        label = record['model'].lower()
+        if label not in IMPORT_ORDER:
+            if label != USER_LABEL:
+                self.skipped[label] += 1
+            return
+        model = apps.get_model(label)
+
+        natural_key = None
+        if label in NATURAL_KEYS:
+            # Категории и местоположения сопоставляются с существующими.
+            natural_key = record['fields'][NATURAL_KEYS[label]]
+            existing_pk = self._natural_pk(label, natural_key)
+            if existing_pk is not None:
+                self.id_maps[label][record['pk']] = existing_pk
+                self.skipped[label] += 1
+                return
+
+        obj = self._build(model, record)
+        if obj is None:
+            # Ссылка вперёд по файлу: пробуем ещё раз после всего потока.
+            self.pending.append(record)
+            return
+
+        obj.pk = self.next_pk[label]
+        self.next_pk[label] += 1
+        self.id_maps[label][record['pk']] = obj.pk
+        if natural_key is not None:
+            self.natural_pks[label][natural_key] = obj.pk
+        self.buffers[label].append(obj)
+        self.buffered += 1
+        if self.buffered >= self.batch_size:
+            self._flush()
+
+    def _flush(self):
+        with transaction.atomic():
+            for label in IMPORT_ORDER:
+                objects = self.buffers.pop(label, [])
+                if objects:
+                    apps.get_model(label).objects.bulk_create(objects)
+                    self.created[label] += len(objects)
+        self.buffered = 0
+
+    def _report(self, elapsed):
+        for label, count in sorted(self.created.items()):
+            self.stdout.write(f'{label}: добавлено {count}')
+        for label, count in sorted(self.skipped.items()):
+            self.stdout.write(f'{label}: пропущено {count}')
+        total = sum(self.created.values())
+        rate = total / elapsed if elapsed else total
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено строк: {total} за {elapsed:.2f} с'
+            f' ({rate:.0f} строк/с)'
+        ))
@@ -0,0 +1,227 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from blog.bulk import finish_bulk_load, next_pk, preserve_auto_now_add
+from blog.models import Category, Comment, Location, Post
+
+FAKER_LOCALE = 'ru_RU'
+SEED_PASSWORD = 'seed-password'
+DEFAULT_BATCH_SIZE = 1000
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу синтетическими пользователями, категориями,'
+        ' местоположениями, публикациями и комментариями для нагрузочных'
+        ' замеров.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--locations', type=int, default=30)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument(
+            '--days', type=int, default=365,
+            help='На сколько дней назад распределять даты публикаций.',
+        )
+        parser.add_argument(
+            '--author-skew', type=float, default=1.1,
+            help='Показатель закона Ципфа для распределения постов по'
+                 ' авторам; 0 — равномерно.',
+        )
+        parser.add_argument(
+            '--future-share', type=float, default=0.05,
+            help='Доля отложенных публикаций с датой в будущем.',
+        )
+        parser.add_argument(
+            '--hidden-share', type=float, default=0.03,
+            help='Доля снятых с публикации постов и категорий.',
+        )
+        parser.add_argument(
+            '--comment-alpha', type=float, default=1.3,
+            help='Параметр распределения Парето для числа комментариев'
+                 ' к посту: чем меньше, тем тяжелее хвост.',
+        )
+        parser.add_argument(
+            '--max-comments', type=int, default=500,
+            help='Верхняя граница числа комментариев к обычному посту.',
+        )
+        parser.add_argument(
+            '--hot-comments', type=int, default=0,
+            help='Сколько комментариев добавить к первому сгенерированному'
+                 ' опубликованному посту.',
+        )
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.fake = Faker(FAKER_LOCALE)
+        self.fake.seed_instance(options['seed'])
+        self.now = timezone.now()
+        self.buffers = {Post: [], Comment: []}
+        self.created = {}
+
+        started = time.monotonic()
+        with preserve_auto_now_add(Category, Location, Post, Comment):
+            authors = self._seed_users()
+            categories = self._seed_categories()
+            locations = self._seed_locations()
+            first_post_pk = next_pk(Post)
+            self._seed_posts(authors, categories, locations)
+        finish_bulk_load(Post.objects.filter(pk__gte=first_post_pk))
+
+        elapsed = time.monotonic() - started
+        for model, count in self.created.items():
+            self.stdout.write(f'{model._meta.label_lower}: {count}')
+        total = sum(self.created.values())
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано строк: {total} за {elapsed:.2f} с'
+            f' ({total / elapsed if elapsed else total:.0f} строк/с)'
+        ))
+
+    def _bulk_create(self, model, objects):
+        model.objects.bulk_create(
+            objects, batch_size=self.options['batch_size']
+        )
+        self.created[model] = self.created.get(model, 0) + len(objects)
+
+    def _past(self, days):
+        return self.now - timedelta(seconds=self.random.uniform(
+            0, days * 24 * 3600
+        ))
+
+    def _seed_users(self):
+        password = make_password(SEED_PASSWORD)
+        start = next_pk(User)
+        users = [
+            User(
+                pk=pk,
+                username=f'{self.fake.user_name()}{pk}',
+                first_name=self.fake.first_name(),
+                last_name=self.fake.last_name(),
+                email=self.fake.email(),
+                password=password,
+            )
+            for pk in range(start, start + self.options['users'])
+        ]
+        self._bulk_create(User, users)
+        # Небольшая часть авторов пишет большую часть постов.
+        skew = self.options['author_skew']
+        weights = [1 / rank ** skew for rank in range(1, len(users) + 1)]
+        return [user.pk for user in users], weights
+
+    def _seed_categories(self):
+        start = next_pk(Category)
+        categories = [
+            Category(
+                pk=pk,
+                title=self.fake.sentence(nb_words=2).rstrip('.'),
+                description=self.fake.paragraph(),
+                slug=f'category-{pk}',
+                is_published=(
+                    self.random.random() >= self.options['hidden_share']
+                ),
+                created_at=self._past(self.options['days']),
+            )
+            for pk in range(start, start + self.options['categories'])
+        ]
+        self._bulk_create(Category, categories)
+        return [category.pk for category in categories]
+
+    def _seed_locations(self):
+        start = next_pk(Location)
+        locations = [
+            Location(
+                pk=pk,
+                name=self.fake.city(),
+                created_at=self._past(self.options['days']),
+            )
+            for pk in range(start, start + self.options['locations'])
+        ]
+        self._bulk_create(Location, locations)
+        return [location.pk for location in locations]
+
+    def _comment_total(self, post):
+        if post.pk == self.hot_post_pk:
+            return self.options['hot_comments']
+        if post.pub_date > self.now:
+            return 0
+        count = int(self.random.paretovariate(self.options['comment_alpha']))
+        return min(count - 1, self.options['max_comments'])
+
+    def _seed_posts(self, authors, categories, locations):
+        author_ids, weights = authors
+        self.hot_post_pk = None
+        post_pk = next_pk(Post)
+        comment_pk = next_pk(Comment)
+        for _ in range(self.options['posts']):
+            if self.random.random() < self.options['future_share']:
+                pub_date = self.now + timedelta(
+                    seconds=self.random.uniform(60, 30 * 24 * 3600)
+                )
+            else:
+                pub_date = self._past(self.options['days'])
+            post = Post(
+                pk=post_pk,
+                title=self.fake.sentence(nb_words=5).rstrip('.'),
+                text='\n\n'.join(
+                    self.fake.paragraphs(nb=self.random.randint(1, 5))
+                ),
+                pub_date=pub_date,
+                author_id=self.random.choices(author_ids, weights)[0],
+                category_id=self.random.choice(categories),
+                location_id=(
+                    self.random.choice(locations)
+                    if locations and self.random.random() < 0.7 else None
+                ),
+                is_published=(
+                    self.random.random() >= self.options['hidden_share']
+                ),
+                created_at=min(pub_date, self.now),
+            )
+            if (self.hot_post_pk is None and post.is_published
+                    and pub_date <= self.now):
+                self.hot_post_pk = post.pk
+            post_pk += 1
+            self.buffers[Post].append(post)
+
+            for _ in range(self._comment_total(post)):
+                self.buffers[Comment].append(Comment(
+                    pk=comment_pk,
+                    text=self.fake.sentence(
+                        nb_words=self.random.randint(3, 30)
+                    ),
+                    post_id=post.pk,
+                    author_id=self.random.choice(author_ids),
+                    created_at=post.created_at + timedelta(
+                        seconds=self.random.uniform(
+                            0, (self.now - post.created_at).total_seconds()
+                        )
+                    ),
+                ))
+                comment_pk += 1
+
+            if len(self.buffers[Post]) >= self.options['batch_size']:
+                self._flush()
+        self._flush()
+
+    def _flush(self):
+        with transaction.atomic():
+            for model in (Post, Comment):
+                self._bulk_create(model, self.buffers[model])
+                self.buffers[model] = []
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import bump_version
+from blog.models import Post
+from blog.utils import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Сверяет Post.comment_count с фактическим числом комментариев.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать число расхождений, ничего не исправляя.',
+        )
+
+    def handle(self, *args, **options):
+        drifted = recount_comments(
+            Post.objects.all(), dry_run=options['dry_run']
+        )
+        if not options['dry_run']:
+            for post_id in drifted:
+                bump_version('post', post_id)
+        verb = 'Найдено' if options['dry_run'] else 'Исправлено'
+        self.stdout.write(f'{verb} расхождений: {len(drifted)}')
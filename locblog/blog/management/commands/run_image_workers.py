@@ -0,0 +1,71 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+
+from blog.images import build_derivatives
+from blog.jobs import claim_jobs, finish_job, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Запускает воркеры, которые готовят уменьшенные копии изображений.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Число процессов-обработчиков.',
+        )
+        parser.add_argument(
+            '--batch',
+            type=int,
+            default=20,
+            help='Сколько задач забирать из очереди за раз.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Пауза между опросами пустой очереди, в секундах.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать очередь и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale_jobs()
+        if requeued:
+            self.stdout.write(
+                f'Возвращено в очередь зависших задач: {requeued}'
+            )
+
+        with ProcessPoolExecutor(max_workers=options['workers']) as pool:
+            while True:
+                jobs = claim_jobs(options['batch'])
+                if not jobs:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+                self._run_batch(pool, jobs)
+
+    def _run_batch(self, pool, jobs):
+        futures = {
+            pool.submit(build_derivatives, path): pk for pk, path in jobs
+        }
+        for future in as_completed(futures):
+            pk = futures[future]
+            try:
+                created = future.result()
+            except Exception as error:
+                finish_job(pk, error=f'{type(error).__name__}: {error}')
+                self.stderr.write(f'Задача {pk}: {error}')
+            else:
+                finish_job(pk, derivatives=created)
+                self.stdout.write(
+                    f'Задача {pk}: создано файлов'
+                    f' {sum(map(len, created.values()))}'
+                )
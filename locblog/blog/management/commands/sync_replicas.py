@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog.cache import mark_replica_synced
+from blog.replicas import replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплики из BLOG_REPLICA_DATABASES'
+        ' для локальной проверки чтения с реплик.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'aliases', nargs='*',
+            help='Псевдонимы реплик; по умолчанию все из настроек.',
+        )
+
+    def handle(self, *args, **options):
+        aliases = options['aliases'] or replica_aliases()
+        if not aliases:
+            raise CommandError('Реплики не настроены: BLOG_REPLICA_DATABASES'
+                               ' пуст.')
+        source = connections[DEFAULT_DB_ALIAS]
+        for alias in (DEFAULT_DB_ALIAS, *aliases):
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f'База {alias} не SQLite.')
+
+        for alias in aliases:
+            started = time.monotonic()
+            source.ensure_connection()
+            target = connections[alias]
+            target.ensure_connection()
+            # Онлайн-копия через backup API: целостна даже при записи в
+            # основную базу и не ломает открытые соединения реплики.
+            source.connection.backup(target.connection)
+            mark_replica_synced(alias)
+            self.stdout.write(
+                f'{alias}: {time.monotonic() - started:.2f} с'
+            )
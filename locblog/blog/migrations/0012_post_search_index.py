@@ -0,0 +1,62 @@
+import re
+
+from django.db import migrations
+
+try:
+    import snowballstemmer
+except ImportError:
+    snowballstemmer = None
+
+# Копия blog.search на момент миграции: тот модуль импортирует текущие
+# модели, и их будущие изменения не должны ломать накат старых баз.
+FTS_TABLE = 'blog_post_fts'
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile(r'[а-яё]')
+
+
+def stem_text(text, stemmers):
+    words = WORD_RE.findall(text.lower())
+    if not stemmers:
+        return ' '.join(words)
+    return ' '.join(
+        stemmers[
+            'russian' if CYRILLIC_RE.search(word) else 'english'
+        ].stemWord(word)
+        for word in words
+    )
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    Post = apps.get_model('blog', 'Post')
+    stemmers = snowballstemmer and {
+        language: snowballstemmer.stemmer(language)
+        for language in ('russian', 'english')
+    }
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+        "title, text, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    for pk, title, text in Post.objects.values_list('pk', 'title', 'text'):
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text) VALUES (%s, %s, %s)',
+            [pk, stem_text(title, stemmers), stem_text(text, stemmers)],
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_imagejob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 3.2.16 on 2026-10-18 00:35
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_post_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagejob',
+            name='post',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='image_jobs', to='blog.post', verbose_name='Пост'),
+        ),
+    ]
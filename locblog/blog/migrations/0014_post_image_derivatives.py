@@ -0,0 +1,34 @@
+# Generated by Django 3.2.16 on 2026-10-18 00:55
+
+from django.db import migrations, models
+
+
+def enqueue_existing_images(apps, schema_editor):
+    # Список копий раньше не сохранялся: обработчик очереди заново создаст
+    # копии для уже загруженных изображений и запишет его.
+    Post = apps.get_model('blog', 'Post')
+    ImageJob = apps.get_model('blog', 'ImageJob')
+    ImageJob.objects.bulk_create(
+        ImageJob(post_id=pk, image=image)
+        for pk, image in Post.objects.exclude(image='').values_list(
+            'pk', 'image'
+        ).iterator()
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0013_imagejob_post'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_derivatives',
+            field=models.JSONField(default=dict, editable=False, verbose_name='Уменьшенные копии изображения'),
+        ),
+        migrations.RunPython(
+            enqueue_existing_images, migrations.RunPython.noop
+        ),
+    ]
@@ -91,11 +91,44 @@ class Post(BaseModel):
         blank=True
     )
 
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев',
+    )
+    image_derivatives = models.JSONField(
+        default=dict,
+        editable=False,
+        verbose_name='Уменьшенные копии изображения',
+    )
+
     class Meta:
         default_related_name = 'posts'
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ['-pub_date']
+        indexes = (
+            # Частичные индексы повторяют фильтр публичной ленты: условие
+            # `is_published` в WHERE совпадает с условием индекса, и
+            # сортировка по (pub_date, id) читается из индекса без TEMP B-TREE.
+            # Остальные столбцы делают индексы покрывающими для выборки id.
+            models.Index(
+                fields=('pub_date', 'id', 'category'),
+                name='post_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', 'pub_date', 'id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=(
+                    'author', 'pub_date', 'id', 'is_published', 'category'
+                ),
+                name='post_author_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return self.title[:CLASS_STRING_LIMIT]
@@ -120,7 +153,65 @@ class Comment(BaseModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['created_at']
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at', 'id'),
+                name='comment_post_created_at_idx',
+            ),
+        )
 
     def __str__(self):
         return (f'{self.author} написал в посте {self.post}: '
                 f'{self.text[:CLASS_STRING_LIMIT]}')
+
+
+class ImageJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        null=True,
+        related_name='image_jobs',
+        verbose_name='Пост',
+    )
+    image = models.CharField(max_length=256, verbose_name='Файл изображения')
+    status = models.CharField(
+        max_length=16,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+        verbose_name='Статус',
+    )
+    error = models.TextField(blank=True, verbose_name='Ошибка')
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Добавлено'
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Начато'
+    )
+
+    class Meta:
+        verbose_name = 'обработка изображения'
+        verbose_name_plural = 'Обработка изображений'
+        ordering = ['created_at']
+        indexes = (
+            models.Index(
+                fields=('status', 'created_at'),
+                name='imagejob_status_idx',
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.image} ({self.get_status_display()})'
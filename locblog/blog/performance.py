@@ -0,0 +1,162 @@
+import json
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger('blog.performance')
+
+N_PLUS_ONE_THRESHOLD = 5
+IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+_current_metrics = ContextVar('blog_request_metrics', default=None)
+
+
+def normalize_sql(sql):
+    return IN_LIST.sub('IN (...)', sql)
+
+
+class RequestMetrics:
+    """Счётчики одного запроса; сам объект подключается как execute_wrapper.
+
+    SQL, выполненный во время отрисовки шаблона (ленивые связи, вызовы
+    методов моделей из шаблона), учитывается отдельно, чтобы не попасть
+    во время шаблонов дважды.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_db_time = 0.0
+        self.template_depth = 0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.queries += 1
+            self.db_time += elapsed
+            if self.template_depth:
+                self.template_db_time += elapsed
+            self.statements[normalize_sql(sql)] += 1
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        return [
+            (sql, count)
+            for sql, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+class TimedTemplate:
+
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        metrics = _current_metrics.get()
+        if metrics is None:
+            return self.template.render(context, request)
+        # Вложенные шаблоны (include, inclusion_tag) уже входят во время
+        # внешнего, поэтому засекается только самый внешний.
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            metrics.template_depth -= 1
+            if not metrics.template_depth:
+                metrics.template_time += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class PerformanceMiddleware:
+    """Число запросов и время SQL, шаблонов и кода представления.
+
+    Результат пишется строкой JSON в логгер `blog.performance` и, если
+    включена настройка `BLOG_SERVER_TIMING`, в заголовок `Server-Timing`.
+    Одинаковые (с точностью до параметров) запросы, повторённые не меньше
+    `BLOG_N_PLUS_ONE_THRESHOLD` раз, отмечаются как вероятный N+1.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+        self.report(request, response, metrics, time.perf_counter() - started)
+        return response
+
+    def report(self, request, response, metrics, total):
+        template = max(metrics.template_time - metrics.template_db_time, 0)
+        view = max(total - metrics.db_time - template, 0)
+        match = request.resolver_match
+        view_name = match.view_name if match else None
+        timings = {
+            'db': metrics.db_time * 1000,
+            'tpl': template * 1000,
+            'view': view * 1000,
+            'total': total * 1000,
+        }
+
+        if getattr(settings, 'BLOG_SERVER_TIMING', False):
+            entries = [
+                f'{name};dur={duration:.1f}'
+                for name, duration in timings.items()
+            ]
+            entries[0] += f';desc="{metrics.queries} queries"'
+            response['Server-Timing'] = ', '.join(entries)
+
+        logger.info(json.dumps({
+            'event': 'request',
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': metrics.queries,
+            **{f'{name}_ms': round(value, 2)
+               for name, value in timings.items()},
+        }, ensure_ascii=False))
+
+        repeated = metrics.repeated(getattr(
+            settings, 'BLOG_N_PLUS_ONE_THRESHOLD', N_PLUS_ONE_THRESHOLD
+        ))
+        if repeated:
+            logger.warning(json.dumps({
+                'event': 'n_plus_one',
+                'view': view_name,
+                'path': request.path,
+                'statements': [
+                    {'sql': sql, 'count': count} for sql, count in repeated
+                ],
+            }, ensure_ascii=False))
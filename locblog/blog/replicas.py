@@ -0,0 +1,102 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = 'blog_primary'
+DEFAULT_PIN_SECONDS = 10
+READ_METHODS = ('GET', 'HEAD')
+# Сессии, пользователи и права читаются только с основной базы: от них
+# зависит, кто делает запрос и что ему можно видеть.
+PRIMARY_APPS = ('auth', 'sessions', 'contenttypes')
+
+_read_alias = ContextVar('blog_read_alias', default=None)
+
+
+def replica_reads(view):
+    """Помечает представление, которое только читает из базы."""
+    view.replica_reads = True
+    return view
+
+
+def replica_aliases():
+    return list(getattr(settings, 'BLOG_REPLICA_DATABASES', ()))
+
+
+def current_replica():
+    """Псевдоним реплики, с которой читает текущий запрос, или None."""
+    return _read_alias.get()
+
+
+def reading_from_replica():
+    """Читает ли текущий запрос с реплики."""
+    return current_replica() is not None
+
+
+def read_from_primary():
+    """Переводит оставшееся чтение текущего запроса на основную базу."""
+    _read_alias.set(None)
+
+
+class ReplicaRouter:
+    """Чтение внутри помеченных представлений идёт на реплику.
+
+    Реплику для запроса выбирает ReplicaMiddleware; вне него, а также для
+    записи, миграций и моделей из PRIMARY_APPS используется основная база.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_APPS:
+            return DEFAULT_DB_ALIAS
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплики получают схему вместе с данными при синхронизации.
+        return db not in replica_aliases()
+
+
+class ReplicaMiddleware:
+    """Выбирает реплику для анонимных запросов к помеченным представлениям.
+
+    Авторизованные пользователи всегда читают с основной базы: им видны
+    собственные черновики и изменения. После запроса на запись браузер
+    получает cookie, и следующие `BLOG_REPLICA_PIN_SECONDS` секунд его
+    запросы тоже читают с основной базы, даже если он уже вышел.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        if request.method not in READ_METHODS and response.status_code < 500:
+            response.set_cookie(
+                PIN_COOKIE, '1',
+                max_age=getattr(
+                    settings, 'BLOG_REPLICA_PIN_SECONDS', DEFAULT_PIN_SECONDS
+                ),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        aliases = replica_aliases()
+        if not (aliases and getattr(view_func, 'replica_reads', False)
+                and request.method in READ_METHODS
+                and PIN_COOKIE not in request.COOKIES):
+            return
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return
+        _read_alias.set(random.choice(aliases))
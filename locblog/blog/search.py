@@ -0,0 +1,148 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+try:
+    import snowballstemmer
+except ImportError:
+    snowballstemmer = None
+
+FTS_TABLE = 'blog_post_fts'
+SEARCH_LIMIT = 50
+# Вес совпадения в заголовке относительно совпадения в тексте для bm25().
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+WORD_RE = re.compile(r'\w+')
+CYRILLIC_RE = re.compile(r'[а-яё]')
+
+_stemmers = {}
+
+
+def _stem_word(word):
+    if snowballstemmer is None:
+        return word
+    language = 'russian' if CYRILLIC_RE.search(word) else 'english'
+    if language not in _stemmers:
+        _stemmers[language] = snowballstemmer.stemmer(language)
+    return _stemmers[language].stemWord(word)
+
+
+def stem_words(text):
+    return [_stem_word(word) for word in WORD_RE.findall(text.lower())]
+
+
+def stem_text(text):
+    return ' '.join(stem_words(text))
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def index_post(post):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+        cursor.execute(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+            ' VALUES (%s, %s, %s)',
+            [post.pk, stem_text(post.title), stem_text(post.text)],
+        )
+
+
+def unindex_post(post_id):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_search_index(batch_size=1000):
+    if not is_available():
+        return 0
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        batch = []
+        indexed = 0
+        rows = Post.objects.order_by().values_list('pk', 'title', 'text')
+        for pk, title, text in rows.iterator(chunk_size=batch_size):
+            batch.append((pk, stem_text(title), stem_text(text)))
+            if len(batch) >= batch_size:
+                cursor.executemany(
+                    f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+                    ' VALUES (%s, %s, %s)',
+                    batch,
+                )
+                indexed += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, text)'
+                ' VALUES (%s, %s, %s)',
+                batch,
+            )
+            indexed += len(batch)
+    return indexed
+
+
+def build_match_query(query):
+    # Каждое слово — отдельная фраза с префиксным поиском: так запрос
+    # пользователя не может сломать синтаксис MATCH.
+    return ' '.join(f'"{stem}"*' for stem in stem_words(query))
+
+
+def _fallback_condition(query):
+    return Q(title__icontains=query) | Q(text__icontains=query)
+
+
+def search_condition(query):
+    """Условие для filter(): посты, подходящие под запрос.
+
+    Список id не собирается в Python: в SQLite это подзапрос к индексу,
+    поэтому условие годится и для результатов любого размера.
+    """
+    match = build_match_query(query)
+    if not match:
+        return Q(pk__in=[])
+    if not is_available():
+        return _fallback_condition(query)
+    return Q(pk__in=RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match]
+    ))
+
+
+def search_post_ids(query, posts=None, limit=SEARCH_LIMIT):
+    """Id постов по убыванию релевантности.
+
+    Если передан queryset `posts`, он ограничивает выдачу прямо в запросе
+    к индексу, до LIMIT: скрытые посты не занимают места в первых `limit`.
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    if not is_available():
+        found = Post.objects.filter(_fallback_condition(query))
+        if posts is not None:
+            found = found.filter(pk__in=posts.values('pk'))
+        return list(found.values_list('pk', flat=True)[:limit])
+    sql = f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+    params = [match]
+    if posts is not None:
+        posts_sql, posts_params = posts.order_by().values(
+            'pk'
+        ).query.sql_with_params()
+        sql += f' AND rowid IN ({posts_sql})'
+        params.extend(posts_params)
+    sql += f' ORDER BY bm25({FTS_TABLE}, {TITLE_WEIGHT}, {TEXT_WEIGHT})'
+    if limit is not None:
+        sql += ' LIMIT %s'
+        params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
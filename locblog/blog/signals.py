@@ -0,0 +1,130 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import bump_version
+from .feeds import (GLOBAL_SCOPE, author_scope, category_scope, clear_feeds,
+                    invalidate_feeds)
+from .models import Category, Comment, Location, Post
+from .search import index_post, unindex_post
+from .sqlite import apply_pragmas
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+def after_commit_too(func, *args):
+    """Выполняет func сразу и ещё раз после фиксации текущей транзакции.
+
+    Пока транзакция не зафиксирована, другие запросы видят старые данные и
+    могут положить их в кеш под новой меткой; повтор после фиксации делает
+    такие записи недостижимыми. Вне транзакции хватает одного вызова.
+    """
+    func(*args)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(func, *args))
+
+
+def bump_after_commit(scope, pk):
+    after_commit_too(bump_version, scope, pk)
+
+
+@receiver([post_save, post_delete], sender=Post)
+def bump_post_version(sender, instance, **kwargs):
+    bump_after_commit('post', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Comment)
+def bump_commented_post_version(sender, instance, **kwargs):
+    bump_after_commit('post', instance.post_id)
+
+
+@receiver([post_save, post_delete], sender=Category)
+def bump_category_version(sender, instance, **kwargs):
+    bump_after_commit('category', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Location)
+def bump_location_version(sender, instance, **kwargs):
+    bump_after_commit('location', instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def bump_user_version(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    bump_after_commit('user', instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender, instance, **kwargs):
+    index_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+def post_feed_scopes(category_slug, username):
+    scopes = [GLOBAL_SCOPE, author_scope(username)]
+    if category_slug:
+        scopes.append(category_scope(category_slug))
+    return scopes
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_feed_scopes(sender, instance, raw=False, **kwargs):
+    if raw or instance.pk is None:
+        return
+    # Пост мог сменить категорию или автора: старая лента тоже устарела.
+    previous = Post.objects.filter(pk=instance.pk).values_list(
+        'category__slug', 'author__username'
+    ).first()
+    instance._previous_feed_scopes = (
+        post_feed_scopes(*previous) if previous else []
+    )
+
+
+@receiver([post_save, post_delete], sender=Post)
+def invalidate_post_feeds(sender, instance, **kwargs):
+    after_commit_too(
+        invalidate_feeds,
+        *getattr(instance, '_previous_feed_scopes', ()),
+        *post_feed_scopes(
+            instance.category.slug if instance.category_id else None,
+            instance.author.get_username(),
+        ),
+    )
+
+
+@receiver([post_save, post_delete], sender=Category)
+@receiver([post_save, post_delete], sender=User)
+def clear_all_feeds(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    after_commit_too(clear_feeds)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    apply_pragmas(connection)
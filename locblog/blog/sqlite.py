@@ -0,0 +1,34 @@
+from django.conf import settings
+
+
+def pragma_statements(pragmas):
+    # Значение None отключает настройку, унаследованную из базового профиля.
+    return [
+        f'PRAGMA {name} = {value}'
+        for name, value in pragmas.items()
+        if value is not None
+    ]
+
+
+def apply_pragmas(connection, pragmas=None):
+    """Выполняет PRAGMA из `BLOG_SQLITE_PRAGMAS` на новом соединении.
+
+    Настройки вроде synchronous и cache_size действуют только на текущее
+    соединение, поэтому их нужно повторять при каждом подключении.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    if pragmas is None:
+        pragmas = getattr(settings, 'BLOG_SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for statement in pragma_statements(pragmas):
+            cursor.execute(statement)
+
+
+def read_pragmas(connection, names):
+    values = {}
+    with connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    return values
@@ -0,0 +1,80 @@
+import gzip
+import json
+
+READ_CHUNK_SIZE = 64 * 1024
+SEPARATORS = ' \t\r\n,'
+
+
+def open_text(path, mode='rt', newline=None):
+    path = str(path)
+    if path.endswith('.gz'):
+        return gzip.open(path, mode, encoding='utf-8', newline=newline)
+    return open(path, mode, encoding='utf-8', newline=newline)
+
+
+class _ChunkBuffer:
+
+    def __init__(self, fp, chunk_size):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ''
+        self.position = 0
+        self.eof = False
+
+    def read_more(self):
+        chunk = self.fp.read(self.chunk_size)
+        self.eof = not chunk
+        self.text = self.text[self.position:] + chunk
+        self.position = 0
+
+    def peek(self):
+        """Пропускает разделители и возвращает следующий значащий символ."""
+        while True:
+            while (self.position < len(self.text)
+                   and self.text[self.position] in SEPARATORS):
+                self.position += 1
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if self.eof:
+                raise ValueError('Неожиданный конец JSON-массива')
+            self.read_more()
+
+
+def iter_json_array(fp, chunk_size=READ_CHUNK_SIZE):
+    """Построчно отдаёт элементы JSON-массива верхнего уровня.
+
+    Файл читается кусками по `chunk_size`, в памяти держится только
+    необработанный хвост буфера. Элементами должны быть объекты или массивы:
+    число на границе куска было бы разобрано не целиком.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _ChunkBuffer(fp, chunk_size)
+    if buffer.peek() != '[':
+        raise ValueError('Ожидался JSON-массив')
+    buffer.position += 1
+    while buffer.peek() != ']':
+        try:
+            item, buffer.position = decoder.raw_decode(
+                buffer.text, buffer.position
+            )
+        except json.JSONDecodeError:
+            if buffer.eof:
+                raise
+            buffer.read_more()
+            continue
+        yield item
+
+
+def iter_jsonl(fp):
+    for line in fp:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_records(path):
+    with open_text(path) as fp:
+        if str(path).endswith(('.jsonl', '.jsonl.gz')):
+            yield from iter_jsonl(fp)
+        else:
+            yield from iter_json_array(fp)
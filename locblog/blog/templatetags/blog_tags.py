@@ -0,0 +1,32 @@
+from django import template
+
+from blog.cache import render_post_card
+from blog.images import FALLBACK_EXTENSION, MIME_TYPES, get_derivatives
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_card(post):
+    return render_post_card(post)
+
+
+@register.inclusion_tag('includes/responsive_image.html')
+def responsive_image(image, sizes='40rem', css_class=''):
+    derivatives = get_derivatives(image)
+    fallback = derivatives.pop(FALLBACK_EXTENSION, [])
+    return {
+        'image': image,
+        'sizes': sizes,
+        'css_class': css_class,
+        'sources': [
+            {
+                'type': MIME_TYPES[extension],
+                'srcset': ', '.join(f'{url} {width}w' for url, width in urls),
+            }
+            for extension, urls in derivatives.items()
+        ],
+        'fallback_srcset': ', '.join(
+            f'{url} {width}w' for url, width in fallback
+        ),
+    }
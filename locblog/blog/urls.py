@@ -6,11 +6,27 @@ app_name = 'blog'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('search/', views.search, name='search'),
     path(
         'category/<slug:category_slug>/',
         views.category_posts,
         name='category_posts'
     ),
+    path(
+        'feeds/<str:feed_format>/',
+        views.posts_feed,
+        name='posts_feed'
+    ),
+    path(
+        'feeds/category/<slug:category_slug>/<str:feed_format>/',
+        views.category_feed,
+        name='category_feed'
+    ),
+    path(
+        'feeds/author/<str:username>/<str:feed_format>/',
+        views.author_feed,
+        name='author_feed'
+    ),
     path(
         'profile/edit/',
         views.edit_profile,
@@ -26,6 +42,11 @@ urlpatterns = [
         views.post_detail,
         name='post_detail'
     ),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         'posts/create/',
         views.post_create_or_edit,
@@ -1,10 +1,36 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
 from datetime import datetime
 
-from django.core.paginator import Paginator
-from django.db.models import Count, QuerySet
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Count, F, OuterRef, Q, QuerySet, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .models import Comment, Post
 
 ITEMS_PER_PAGE = 10
+FEED_ORDERING = ('-pub_date', '-id')
+FEED_RELATED = ('category', 'author', 'location')
+
+COMMENTS_PER_PAGE = 50
+COMMENT_ORDERING = ('created_at', 'id')
+
+COUNT_EXACT = 'exact'
+COUNT_CACHED = 'cached'
+COUNT_NONE = 'none'
+COUNT_CACHE_TIMEOUT = 60
+
+CURSOR_NEXT = 'n'
+CURSOR_PREVIOUS = 'p'
+CURSOR_LAST = 'l'
+CURSOR_SCALARS = (str, int, float)
 
 
 def filter_posts(
@@ -18,21 +44,337 @@ def filter_posts(
         filters['category__is_published'] = True
         filters['pub_date__lte'] = get_current_date()
 
-    return post_objects.select_related('category', 'author',
-                                       'location').filter(**filters)
+    return post_objects.filter(**filters)
 
 
 def get_current_date() -> datetime:
     return timezone.now()
 
 
-def annotate_comment_count(posts: QuerySet) -> QuerySet:
-    return posts.annotate(comment_count=Count('comments'))
+def recount_comments(posts: QuerySet, dry_run=False) -> list:
+    actual = Coalesce(Subquery(
+        Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+            'post'
+        ).annotate(total=Count('pk')).values('total')
+    ), 0)
+    drifted = posts.annotate(actual_count=actual).exclude(
+        comment_count=F('actual_count')
+    ).order_by().values_list('pk', flat=True)
+    drifted_ids = list(drifted)
+    if drifted_ids and not dry_run:
+        posts.model.objects.filter(pk__in=drifted_ids).update(
+            comment_count=actual
+        )
+    return drifted_ids
+
+
+class PostFeed:
+    """Загрузчик ленты в два шага.
+
+    Сначала по покрывающему индексу выбираются только id постов страницы,
+    затем эти посты вместе с категорией, автором и местоположением
+    подгружаются одним запросом `IN (...)`. Соединения и чтение строк
+    таблицы не зависят от размера ленты.
+    """
+
+    def __init__(self, posts: QuerySet = None, author=None):
+        if posts is None:
+            posts = Post.objects.all()
+        self.posts = filter_posts(posts, author=author)
+
+    @staticmethod
+    def page_ids(page: QuerySet) -> list:
+        return list(page.values_list('pk', flat=True))
+
+    @staticmethod
+    def joined(ids) -> QuerySet:
+        # Порядок страницы уже задан списком ids: сортировка по
+        # Meta.ordering стоила бы лишнего временного B-дерева.
+        return Post.objects.select_related(*FEED_RELATED).filter(
+            pk__in=ids
+        ).order_by()
+
+    def hydrate(self, page: QuerySet) -> list:
+        ids = self.page_ids(page)
+        posts = self.joined(ids).in_bulk()
+        return [posts[pk] for pk in ids if pk in posts]
+
+    def paginator(self, per_page=ITEMS_PER_PAGE, **kwargs):
+        return KeysetPaginator(
+            self.posts, per_page, hydrate=self.hydrate, **kwargs
+        )
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+def encode_cursor(direction: str, number, values=()) -> str:
+    payload = json.dumps([direction, number, list(values)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        direction, number, values = json.loads(
+            base64.urlsafe_b64decode(padded.encode())
+        )
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if direction not in (CURSOR_NEXT, CURSOR_PREVIOUS, CURSOR_LAST):
+        raise InvalidCursor(cursor)
+    # Курсор приходит из адреса: JSON может быть корректным, но с чужими
+    # типами, которые дальше сломали бы арифметику и запрос.
+    if not (number is None or type(number) is int):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list) or not all(
+        isinstance(value, CURSOR_SCALARS) for value in values
+    ):
+        raise InvalidCursor(cursor)
+    return direction, number, values
+
+
+class KeysetPage(Sequence):
+
+    def __init__(self, object_list, paginator, number,
+                 has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<KeysetPage {self.number}>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    def _neighbour_number(self, step):
+        if self.number is None:
+            return None
+        return self.number + step
+
+    def next_page_number(self):
+        return self._neighbour_number(1)
+
+    def previous_page_number(self):
+        return self._neighbour_number(-1)
+
+    @property
+    def next_cursor(self):
+        if not self._has_next or not self.object_list:
+            return None
+        return encode_cursor(
+            CURSOR_NEXT,
+            self.next_page_number(),
+            self.paginator.boundary_values(self.object_list[-1]),
+        )
+
+    @property
+    def previous_cursor(self):
+        if not self._has_previous or not self.object_list:
+            return None
+        return encode_cursor(
+            CURSOR_PREVIOUS,
+            self.previous_page_number(),
+            self.paginator.boundary_values(self.object_list[0]),
+        )
+
+    @property
+    def last_cursor(self):
+        return encode_cursor(CURSOR_LAST, None)
+
+
+class KeysetPaginator:
+    """Пагинатор по ключу сортировки вместо OFFSET.
+
+    Каждая страница выбирается условием «строго после/до граничной записи»
+    по полям `ordering`, поэтому стоимость N-й страницы не зависит от N.
+    Последнее поле сортировки должно быть уникальным (обычно `id`).
+    """
+
+    def __init__(self, object_list: QuerySet, per_page=ITEMS_PER_PAGE,
+                 ordering=FEED_ORDERING, count_mode=COUNT_EXACT,
+                 count_key=None, hydrate=None):
+        self.object_list = object_list
+        self.hydrate = hydrate
+        self.per_page = per_page
+        self.ordering = tuple(ordering)
+        self.count_mode = count_mode
+        self.count_key = count_key
+
+    @cached_property
+    def _fields(self):
+        meta = self.object_list.model._meta
+        fields = []
+        for name in self.ordering:
+            descending = name.startswith('-')
+            name = name.lstrip('-')
+            field = meta.pk if name == 'pk' else meta.get_field(name)
+            fields.append((field, descending))
+        return fields
+
+    def boundary_values(self, obj):
+        if isinstance(obj, dict):
+            # Строка из values(): значения ключа переводятся в строки так
+            # же, как для экземпляра модели.
+            obj = self.object_list.model(**{
+                field.attname: obj[field.attname] for field, _ in self._fields
+            })
+        return [field.value_to_string(obj) for field, _ in self._fields]
+
+    def _integer_range(self, field):
+        ops = connections[self.object_list.db].ops
+        low, high = ops.integer_field_ranges.get(
+            field.get_internal_type(), (None, None)
+        )
+        return (
+            -(2 ** 63) if low is None else low,
+            2 ** 63 - 1 if high is None else high,
+        )
+
+    def _parse_values(self, values):
+        if len(values) != len(self._fields):
+            raise InvalidCursor(values)
+        parsed = []
+        try:
+            for (field, _), value in zip(self._fields, values):
+                value = field.to_python(value)
+                field.run_validators(value)
+                if isinstance(value, int):
+                    # У автоключей нет валидаторов диапазона, а огромное
+                    # число ломает запрос с OverflowError.
+                    low, high = self._integer_range(field)
+                    if not low <= value <= high:
+                        raise ValueError(value)
+                parsed.append(value)
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor(values)
+        return parsed
+
+    def _ordered(self, reverse=False):
+        ordering = []
+        for field, descending in self._fields:
+            prefix = '-' if descending != reverse else ''
+            ordering.append(f'{prefix}{field.attname}')
+        return self.object_list.order_by(*ordering)
+
+    def _seek_filter(self, values, reverse=False):
+        condition = Q()
+        equal = {}
+        for (field, descending), value in zip(self._fields, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= Q(**equal, **{f'{field.attname}__{lookup}': value})
+            equal[field.attname] = value
+        return condition
+
+    def _slice(self, queryset, limit):
+        if self.hydrate is not None:
+            return self.hydrate(queryset[:limit])
+        return list(queryset[:limit])
+
+    @cached_property
+    def count(self):
+        if self.count_mode == COUNT_NONE:
+            return None
+        if self.count_mode == COUNT_CACHED and self.count_key:
+            cache_key = f'paginator-count:{self.count_key}'
+            count = cache.get(cache_key)
+            if count is None:
+                count = self.object_list.order_by().count()
+                cache.set(cache_key, count, COUNT_CACHE_TIMEOUT)
+            return count
+        return self.object_list.order_by().count()
+
+    @cached_property
+    def num_pages(self):
+        if self.count is None:
+            return None
+        return max(1, -(-self.count // self.per_page))
+
+    def get_page(self, cursor=None):
+        try:
+            if cursor:
+                return self.page(cursor)
+        except InvalidCursor:
+            pass
+        return self.first_page()
+
+    def first_page(self):
+        rows = self._slice(self._ordered(), self.per_page + 1)
+        return KeysetPage(
+            rows[:self.per_page], self, 1,
+            has_next=len(rows) > self.per_page,
+            has_previous=False,
+        )
+
+    def last_page(self):
+        size = self.per_page
+        if self.num_pages is not None:
+            size = self.count - (self.num_pages - 1) * self.per_page or size
+        rows = self._slice(self._ordered(reverse=True), size + 1)
+        has_previous = len(rows) > size
+        return KeysetPage(
+            rows[:size][::-1], self, self.num_pages,
+            has_next=False,
+            has_previous=has_previous,
+        )
+
+    def page(self, cursor):
+        direction, number, values = decode_cursor(cursor)
+        if direction == CURSOR_LAST:
+            return self.last_page()
+        values = self._parse_values(values)
+        reverse = direction == CURSOR_PREVIOUS
+        queryset = self._ordered(reverse).filter(
+            self._seek_filter(values, reverse)
+        )
+        rows = self._slice(queryset, self.per_page + 1)
+        more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not rows and not reverse:
+            # За граничной записью ничего не осталось: посты удалили или
+            # скрыли после того, как был выдан курсор.
+            return self.last_page()
+        if reverse:
+            rows.reverse()
+            if not more:
+                return self.first_page()
+            return KeysetPage(rows, self, number,
+                              has_next=True, has_previous=more)
+        return KeysetPage(rows, self, number,
+                          has_next=more, has_previous=True)
+
+
+def paginate_data(request, feed: PostFeed, items_per_page=ITEMS_PER_PAGE,
+                  count_key=None):
+    paginator = feed.paginator(
+        items_per_page,
+        count_mode=getattr(
+            settings, 'BLOG_PAGINATION_COUNT_MODE', COUNT_EXACT
+        ),
+        count_key=count_key,
+    )
+    return paginator.get_page(request.GET.get('cursor'))
 
 
-def paginate_data(request, data, items_per_page=ITEMS_PER_PAGE):
-    ordered_data = data.order_by('-pub_date')
-    paginator = Paginator(ordered_data, items_per_page)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    return page_obj
+def paginate_comments(comments: QuerySet, cursor=None,
+                      per_page=COMMENTS_PER_PAGE):
+    paginator = KeysetPaginator(
+        comments, per_page, ordering=COMMENT_ORDERING, count_mode=COUNT_NONE
+    )
+    return paginator.get_page(cursor)
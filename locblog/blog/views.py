@@ -1,45 +1,73 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
-from django.http import Http404
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 
+from .cache import cache_anonymous_page
+from .conditional import condition_on_content
+from .feeds import (GLOBAL_SCOPE, AuthorPostsFeed, CategoryPostsFeed,
+                    PostsFeed, author_scope, category_scope, serve_feed)
 from .forms import CommentForm, PostForm, ProfileForm
+from .jobs import enqueue_derivatives
 from .models import Category, Comment, Post
-from .utils import (annotate_comment_count, filter_posts, get_current_date,
-                    paginate_data)
+from .replicas import replica_reads
+from .search import search_post_ids
+from .utils import (FEED_RELATED, PostFeed, filter_posts, get_current_date,
+                    paginate_comments, paginate_data)
 
+# Только столбцы, которые выводит includes/comments.html.
+COMMENT_LIST_FIELDS = (
+    'text', 'created_at', 'post', 'author__username',
+)
 
-def index(request):
-    posts = filter_posts(
-        annotate_comment_count(Post.objects)
-    )
 
+@replica_reads
+@condition_on_content
+@cache_anonymous_page
+def index(request):
     return render(
         request,
         template_name='blog/index.html',
         context={
-            'page_obj': paginate_data(request, posts),
+            'page_obj': paginate_data(
+                request, PostFeed(), count_key='index'
+            ),
         },
     )
 
 
-def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    post_category = post.category
+def get_visible_post(request, post_id):
+    post = get_object_or_404(
+        Post.objects.select_related(*FEED_RELATED), pk=post_id
+    )
 
     if (
             (
                 not post.is_published
                 or post.pub_date > get_current_date()
-                or not post_category.is_published
+                or not post.category.is_published
             )
-            and post.author != request.user
+            and post.author_id != request.user.pk
     ):
         raise Http404()
+    return post
+
+
+def post_comments_page(post, cursor):
+    return paginate_comments(
+        post.comments.select_related('author').only(*COMMENT_LIST_FIELDS),
+        cursor,
+    )
+
 
+@replica_reads
+@condition_on_content
+def post_detail(request, post_id):
+    post = get_visible_post(request, post_id)
     form = CommentForm()
-    comments = post.comments.select_related('author').all()
+    comments = post_comments_page(post, request.GET.get('comments'))
 
     return render(
         request,
@@ -52,6 +80,38 @@ def post_detail(request, post_id):
     )
 
 
+@condition_on_content
+def post_comments(request, post_id):
+    post = get_visible_post(request, post_id)
+    comments = post_comments_page(post, request.GET.get('cursor'))
+
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'comments': [
+                {
+                    'id': comment.id,
+                    'author': comment.author.username,
+                    'text': comment.text,
+                    'created_at': comment.created_at,
+                }
+                for comment in comments
+            ],
+            'next': comments.next_cursor,
+        })
+
+    return render(
+        request,
+        template_name='includes/comment_list.html',
+        context={
+            'post': post,
+            'comments': comments
+        },
+    )
+
+
+@replica_reads
+@condition_on_content
+@cache_anonymous_page
 def category_posts(request, category_slug):
     category = get_object_or_404(
         Category,
@@ -59,9 +119,7 @@ def category_posts(request, category_slug):
         is_published=True
     )
 
-    posts_by_category = filter_posts(
-        annotate_comment_count(category.posts)
-    )
+    posts_by_category = PostFeed(category.posts)
 
     return render(
         request,
@@ -69,22 +127,24 @@ def category_posts(request, category_slug):
         context={
             'category': category,
             'page_obj': paginate_data(
-                request, posts_by_category
+                request,
+                posts_by_category,
+                count_key=f'category:{category.pk}'
             ),
         }
     )
 
 
+@replica_reads
+@condition_on_content
+@cache_anonymous_page
 def profile(request, username):
     User = get_user_model()
     user = get_object_or_404(User, username=username)
 
     author = user if request.user == user else None
 
-    user_posts = filter_posts(
-        annotate_comment_count(user.posts),
-        author=author
-    )
+    user_posts = PostFeed(user.posts, author=author)
 
     return render(
         request,
@@ -93,12 +153,34 @@ def profile(request, username):
             'profile': user,
             'page_obj': paginate_data(
                 request,
-                user_posts
+                user_posts,
+                count_key=f'profile:{user.pk}:{author is not None}'
             )
         }
     )
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    posts = []
+
+    if query:
+        ranked_ids = search_post_ids(query, filter_posts(Post.objects))
+        found = Post.objects.select_related(*FEED_RELATED).in_bulk(
+            ranked_ids
+        )
+        posts = [found[pk] for pk in ranked_ids if pk in found]
+
+    return render(
+        request,
+        template_name='blog/search.html',
+        context={
+            'query': query,
+            'posts': posts,
+        }
+    )
+
+
 @login_required
 def post_create_or_edit(request, post_id=None):
     post = None
@@ -112,6 +194,8 @@ def post_create_or_edit(request, post_id=None):
         post = form.save(commit=False)
         post.author = request.user
         post.save()
+        if 'image' in form.changed_data:
+            enqueue_derivatives(post)
 
         if post_id:
             return redirect('blog:post_detail', post_id=post_id)
@@ -175,7 +259,8 @@ def add_comment(request, post_id):
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post = post
-        comment.save()
+        with transaction.atomic():
+            comment.save()
 
     return redirect(
         to='blog:post_detail',
@@ -215,7 +300,8 @@ def delete_comment(request, post_id, comment_id):
         raise PermissionDenied()
 
     if request.method == 'POST':
-        comment.delete()
+        with transaction.atomic():
+            comment.delete()
         return redirect('blog:post_detail', post_id=post_id)
 
     return render(
@@ -225,3 +311,27 @@ def delete_comment(request, post_id, comment_id):
             'comment': comment
         }
     )
+
+
+def posts_feed(request, feed_format):
+    return serve_feed(request, GLOBAL_SCOPE, feed_format, PostsFeed)
+
+
+def category_feed(request, category_slug, feed_format):
+    return serve_feed(
+        request,
+        category_scope(category_slug),
+        feed_format,
+        CategoryPostsFeed,
+        category_slug=category_slug,
+    )
+
+
+def author_feed(request, username, feed_format):
+    return serve_feed(
+        request,
+        author_scope(username),
+        feed_format,
+        AuthorPostsFeed,
+        username=username,
+    )
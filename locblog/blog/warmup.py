@@ -0,0 +1,75 @@
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger('blog.performance')
+
+TEMPLATE_SUFFIXES = ('.html', '.txt', '.xml')
+SLOWEST_REPORTED = 5
+
+
+def template_dirs(engine):
+    dirs = []
+    for loader in engine.engine.template_loaders:
+        for source in getattr(loader, 'loaders', (loader,)):
+            if hasattr(source, 'get_dirs'):
+                dirs.extend(Path(directory) for directory in source.get_dirs())
+    return list(dict.fromkeys(dirs))
+
+
+def iter_template_names(engine):
+    for directory in template_dirs(engine):
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                if filename.endswith(TEMPLATE_SUFFIXES):
+                    yield (Path(root) / filename).relative_to(
+                        directory
+                    ).as_posix()
+
+
+def warm_templates():
+    """Компилирует все шаблоны заранее, чтобы их не разбирал первый запрос.
+
+    Имеет смысл вместе с cached.Loader: скомпилированные шаблоны остаются
+    в его кеше. Возвращает число шаблонов и время компиляции в секундах.
+    """
+    started = time.perf_counter()
+    timings = []
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for name in dict.fromkeys(iter_template_names(engine)):
+            template_started = time.perf_counter()
+            try:
+                engine.get_template(name)
+            except TemplateSyntaxError as error:
+                logger.warning('Шаблон %s не скомпилирован: %s', name, error)
+                continue
+            timings.append((time.perf_counter() - template_started, name))
+
+    elapsed = time.perf_counter() - started
+    slowest = ', '.join(
+        f'{name} {duration * 1000:.1f} мс'
+        for duration, name in sorted(timings, reverse=True)[:SLOWEST_REPORTED]
+    )
+    logger.info(
+        'Скомпилировано шаблонов: %d за %.0f мс; дольше всех: %s',
+        len(timings), elapsed * 1000, slowest,
+    )
+    return len(timings), elapsed
+
+
+def warm_on_server_start():
+    """Прогрев из wsgi.py и asgi.py при BLOG_TEMPLATE_WARMUP.
+
+    Не из AppConfig.ready: там он выполнялся бы и для migrate,
+    collectstatic и других команд управления.
+    """
+    if getattr(settings, 'BLOG_TEMPLATE_WARMUP', False):
+        return warm_templates()
+    return None
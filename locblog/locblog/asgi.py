@@ -6,3 +6,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'locblog.settings')
 
 application = get_asgi_application()
+
+# Только при запуске веб-сервера, не для команд управления.
+from blog.warmup import warm_on_server_start  # noqa: E402
+
+warm_on_server_start()
@@ -0,0 +1,20 @@
+"""Настройки проекта; профиль выбирается переменной LOCBLOG_PROFILE.
+
+dev (по умолчанию) — локальная разработка, prod — боевой сервер.
+Профиль можно указать и напрямую: DJANGO_SETTINGS_MODULE=locblog.settings.prod.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILE = os.environ.get('LOCBLOG_PROFILE', 'dev')
+
+if PROFILE == 'dev':
+    from .dev import *  # noqa: F401,F403
+elif PROFILE == 'prod':
+    from .prod import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(
+        f'Неизвестный профиль настроек LOCBLOG_PROFILE={PROFILE!r}:'
+        ' ожидается dev или prod.'
+    )
@@ -0,0 +1,180 @@
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+SECRET_KEY = 'django-insecure-y@jw_(+z)m&xk$u$yqa_!-k1g7n8vcq^!r3$!_u_kyk3%_vt-0'
+
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1'
+]
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'blog.apps.BlogConfig',
+    'pages.apps.PagesConfig',
+    'django_bootstrap5'
+]
+
+MIDDLEWARE = [
+    'blog.performance.PerformanceMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.replicas.ReplicaMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'locblog.urls'
+
+TEMPLATES_DIR = BASE_DIR / 'templates'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'blog.performance.TimedDjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'locblog.wsgi.application'
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+# Чтение в представлениях, помеченных replica_reads, уходит на одну из
+# реплик BLOG_REPLICA_DATABASES (псевдонимы из DATABASES); пустой список —
+# всё читается с основной базы. После записи браузер ещё
+# BLOG_REPLICA_PIN_SECONDS секунд читает с основной.
+DATABASE_ROUTERS = ['blog.replicas.ReplicaRouter']
+BLOG_REPLICA_DATABASES = []
+BLOG_REPLICA_PIN_SECONDS = 10
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'files': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'files',
+    },
+}
+
+# Псевдоним кеша для отрисованных карточек постов: 'default' или 'files'.
+BLOG_FRAGMENT_CACHE = 'default'
+
+# Кеш страниц ленты для анонимных посетителей.
+BLOG_PAGE_CACHE = 'default'
+BLOG_PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Каталог заранее отрисованных RSS- и Atom-лент.
+BLOG_FEEDS_ROOT = BASE_DIR / 'feeds'
+# Адрес сайта для абсолютных ссылок в лентах.
+BLOG_SITE_URL = 'http://127.0.0.1:8000'
+
+# Заголовок Server-Timing с временем SQL, шаблонов и кода представления.
+BLOG_SERVER_TIMING = False
+# Компилировать все шаблоны при запуске веб-сервера (wsgi.py, asgi.py).
+BLOG_TEMPLATE_WARMUP = False
+
+# Сколько одинаковых SQL-запросов за запрос считать признаком N+1.
+BLOG_N_PLUS_ONE_THRESHOLD = 5
+
+# PRAGMA, выполняемые на каждом новом соединении с SQLite, в этом порядке:
+# busy_timeout первым, чтобы переход в WAL ждал блокировку, а не падал.
+# WAL позволяет читать во время записи, synchronous=NORMAL в режиме WAL
+# синхронизирует диск только на контрольных точках. cache_size < 0 — в КиБ.
+BLOG_SQLITE_PRAGMAS = {
+    'busy_timeout': 5000,
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        # INFO — строка JSON на каждый запрос, WARNING — только N+1.
+        'blog.performance': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+        },
+    },
+}
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+LANGUAGE_CODE = 'ru-RU'
+
+TIME_ZONE = 'Europe/Moscow'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+STATIC_URL = '/static/'
+
+STATICFILES_DIRS = [
+    BASE_DIR / 'static'
+]
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
+
+EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+
+LOGIN_URL = '/auth/login/'
+LOGIN_REDIRECT_URL = 'blog:index'
+
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Заранее отрисованные страницы приложения pages (команда prerender_pages).
+# Отдаются только анонимным посетителям; без файлов страницы рендерятся.
+PAGES_PRERENDER_ROOT = BASE_DIR / 'prerendered'
+PAGES_SERVE_PRERENDERED = False
@@ -0,0 +1,21 @@
+import os
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES
+
+DEBUG = True
+
+BLOG_SERVER_TIMING = True
+
+# Локальная проверка реплик: вторая база SQLite, которую заполняет
+# команда sync_replicas.
+if os.environ.get('LOCBLOG_SQLITE_REPLICA'):
+    DATABASES = {
+        **DATABASES,
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.replica.sqlite3',
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+    BLOG_REPLICA_DATABASES = ['replica']
@@ -0,0 +1,100 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, LOGGING, TEMPLATES
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+DEBUG = env_bool('DJANGO_DEBUG')
+if DEBUG:
+    # С DEBUG каждый SQL-запрос копится в connection.queries, а ошибки
+    # показывают настройки и код посетителям.
+    raise ImproperlyConfigured(
+        'Профиль prod нельзя запускать с DEBUG: уберите DJANGO_DEBUG.'
+    )
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Для профиля prod задайте DJANGO_SECRET_KEY.')
+
+ALLOWED_HOSTS = os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+BLOG_SITE_URL = os.environ.get(
+    'DJANGO_SITE_URL', f'https://{ALLOWED_HOSTS[0]}'
+)
+
+# Соединение с базой живёт между запросами вместо открытия на каждый.
+DATABASES = {
+    **DATABASES,
+    'default': {
+        **DATABASES['default'],
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_CONN_MAX_AGE', 600)),
+    },
+}
+
+# Общий для всех рабочих процессов кеш: метки версий и кеш страниц должны
+# сбрасываться сразу во всех процессах, поэтому LocMemCache не подходит.
+# Файловый кеш тоже: при каждой записи (счётчики попаданий, метки версий,
+# карточки) он обходит весь каталог, чтобы вытеснить лишнее.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_MEMCACHED_LOCATION', '127.0.0.1:11211'
+        ).split(','),
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {'no_delay': True, 'ignore_exc': True},
+    },
+    'files': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'cache' / 'files',
+    },
+}
+
+# Сессии читаются из кеша, в базу идёт только запись.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Шаблоны компилируются один раз на процесс и дальше берутся из памяти.
+TEMPLATES = [{
+    **TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+# Имена статических файлов с хешем содержимого: их можно кешировать
+# в браузере бессрочно.
+STATIC_ROOT = BASE_DIR / 'static_collected'
+STATICFILES_STORAGE = (
+    'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+)
+
+BLOG_TEMPLATE_WARMUP = True
+PAGES_SERVE_PRERENDERED = True
+
+# Строка JSON на каждый запрос и отчёт о прогреве шаблонов.
+LOGGING = {
+    **LOGGING,
+    'loggers': {
+        **LOGGING['loggers'],
+        'blog.performance': {
+            **LOGGING['loggers']['blog.performance'],
+            'level': 'INFO',
+        },
+    },
+}
@@ -8,6 +8,7 @@ from django.views.generic.edit import CreateView
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('pages/', include('pages.urls', namespace='pages')),
+    path('api/v1/', include('blog.api_urls', namespace='api_v1')),
     path('auth/', include('django.contrib.auth.urls')),
     path(
         'auth/registration/',
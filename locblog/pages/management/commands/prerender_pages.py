@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from pages.prerender import build_pages, prerender_root
+
+
+class Command(BaseCommand):
+    help = (
+        'Отрисовывает анонимные варианты статических страниц и страниц'
+        ' ошибок в HTML-файлы со сжатыми копиями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            help='Каталог для файлов; по умолчанию PAGES_PRERENDER_ROOT.',
+        )
+
+    def handle(self, *args, **options):
+        built = build_pages(options['output'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово страниц: {len(built)} в'
+            f' {options["output"] or prerender_root()}'
+        ))
@@ -0,0 +1,161 @@
+import gzip
+import os
+import struct
+import zlib
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import resolve, reverse
+from django.utils.cache import patch_vary_headers
+from django.utils.html import escape
+
+# Имя страницы -> шаблон и маршрут, с которым она отрисовывается.
+PRERENDERED_PAGES = {
+    'about': ('pages/about.html', 'pages:about'),
+    'rules': ('pages/rules.html', 'pages:rules'),
+    '404': ('pages/404.html', None),
+    '403csrf': ('pages/403csrf.html', None),
+    '500': ('pages/500.html', None),
+}
+# На его место при ответе подставляется адрес запроса (страница 404).
+URL_MARKER = '__PRERENDERED_REQUEST_URL__'
+GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff'
+
+_loaded = {}
+
+
+def prerender_root():
+    return Path(settings.PAGES_PRERENDER_ROOT)
+
+
+def render_anonymous(template_name, url_name=None):
+    request = HttpRequest()
+    request.method = 'GET'
+    request.user = AnonymousUser()
+    if url_name is not None:
+        request.path = request.path_info = reverse(url_name)
+        request.resolver_match = resolve(request.path)
+    request.build_absolute_uri = lambda location=None: URL_MARKER
+    return render_to_string(template_name, request=request)
+
+
+def build_pages(root=None):
+    """Отрисовывает анонимные варианты страниц в HTML и HTML.gz.
+
+    Запускать после collectstatic: в страницы попадают итоговые адреса
+    статических файлов.
+    """
+    root = Path(root or prerender_root())
+    root.mkdir(parents=True, exist_ok=True)
+    built = []
+    for name, (template_name, url_name) in PRERENDERED_PAGES.items():
+        html = render_anonymous(template_name, url_name).encode()
+        for path, content in (
+            (root / f'{name}.html', html),
+            (root / f'{name}.html.gz', gzip.compress(html, mtime=0)),
+        ):
+            tmp_path = path.with_name(f'.{path.name}.tmp')
+            tmp_path.write_bytes(content)
+            os.replace(tmp_path, path)
+        built.append(name)
+    return built
+
+
+def _deflate(data, mode):
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(mode)
+
+
+class PrerenderedPage:
+    """Готовая страница; для 404 — две части вокруг адреса запроса.
+
+    Сжатые части разделены полным сбросом deflate, поэтому их можно склеить
+    со сжатым на лету адресом, не пережимая всю страницу.
+    """
+
+    def __init__(self, path):
+        html = path.read_bytes()
+        self.prefix, marker, self.suffix = html.partition(URL_MARKER.encode())
+        self.spliced = bool(marker)
+        if self.spliced:
+            self.gzip_prefix = _deflate(self.prefix, zlib.Z_FULL_FLUSH)
+            self.gzip_suffix = _deflate(self.suffix, zlib.Z_FINISH)
+            self.prefix_crc = zlib.crc32(self.prefix)
+        else:
+            gzip_path = path.with_name(f'{path.name}.gz')
+            self.gzipped = (
+                gzip_path.read_bytes() if gzip_path.exists()
+                else gzip.compress(html)
+            )
+
+    def body(self, request, use_gzip):
+        if not self.spliced:
+            return self.gzipped if use_gzip else self.prefix
+        url = escape(request.build_absolute_uri()).encode()
+        if not use_gzip:
+            return self.prefix + url + self.suffix
+        crc = zlib.crc32(self.suffix, zlib.crc32(url, self.prefix_crc))
+        size = len(self.prefix) + len(url) + len(self.suffix)
+        return b''.join((
+            GZIP_HEADER,
+            self.gzip_prefix,
+            _deflate(url, zlib.Z_FULL_FLUSH),
+            self.gzip_suffix,
+            struct.pack('<II', crc, size & 0xffffffff),
+        ))
+
+
+def accepts_gzip(request):
+    """Разрешает ли Accept-Encoding gzip с учётом q-значений.
+
+    Простой поиск подстроки принял бы и отказ вида `gzip;q=0`.
+    """
+    weights = {}
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    for coding in header.split(','):
+        name, *params = (part.strip() for part in coding.split(';'))
+        weight = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.lower()] = weight
+    return weights.get('gzip', weights.get('*', 0.0)) > 0
+
+
+def load_page(name):
+    path = prerender_root() / f'{name}.html'
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _loaded.get(path)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, PrerenderedPage(path))
+        _loaded[path] = cached
+    return cached[1]
+
+
+def prerendered_response(request, name, status=200):
+    """Ответ из готового файла или None, если нужно рендерить шаблон."""
+    if not getattr(settings, 'PAGES_SERVE_PRERENDERED', False):
+        return None
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return None
+    page = load_page(name)
+    if page is None:
+        return None
+
+    use_gzip = accepts_gzip(request)
+    response = HttpResponse(page.body(request, use_gzip), status=status)
+    if use_gzip:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding', 'Cookie'))
+    return response
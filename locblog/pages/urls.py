@@ -1,10 +1,12 @@
 from django.urls import path
 
+from blog.replicas import replica_reads
+
 from . import views
 
 app_name = 'pages'
 
 urlpatterns = [
-    path('about/', views.About.as_view(), name='about'),
-    path('rules/', views.Rules.as_view(), name='rules'),
+    path('about/', replica_reads(views.About.as_view()), name='about'),
+    path('rules/', replica_reads(views.Rules.as_view()), name='rules'),
 ]
@@ -1,22 +1,42 @@
 from django.shortcuts import render
 from django.views.generic import TemplateView
 
+from .prerender import prerendered_response
 
-class About(TemplateView):
+
+class PrerenderedTemplateView(TemplateView):
+    prerendered_name = None
+
+    def get(self, request, *args, **kwargs):
+        response = prerendered_response(request, self.prerendered_name)
+        if response is not None:
+            return response
+        return super().get(request, *args, **kwargs)
+
+
+class About(PrerenderedTemplateView):
     template_name = 'pages/about.html'
+    prerendered_name = 'about'
 
 
-class Rules(TemplateView):
+class Rules(PrerenderedTemplateView):
     template_name = 'pages/rules.html'
+    prerendered_name = 'rules'
 
 
 def page_not_found(request, exception):
-    return render(request, 'pages/404.html', status=404)
+    return prerendered_response(request, '404', status=404) or render(
+        request, 'pages/404.html', status=404
+    )
 
 
 def csrf_failure(request, reason=''):
-    return render(request, 'pages/403csrf.html', status=403)
+    return prerendered_response(request, '403csrf', status=403) or render(
+        request, 'pages/403csrf.html', status=403
+    )
 
 
 def server_error(request):
-    return render(request, 'pages/500.html', status=500)
+    return prerendered_response(request, '500', status=500) or render(
+        request, 'pages/500.html', status=500
+    )
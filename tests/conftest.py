@@ -1,3 +1,4 @@
+import functools
 import os
 import re
 import time
@@ -19,11 +20,13 @@ from typing import (
 import pytest
 from django.apps import apps
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -347,6 +350,27 @@ def get_field_key(field_type: type, field: Field) -> Tuple[str, Optional[str]]:
         return (field_type.__name__, None)
 
 
+def query_budget(budget: int):
+    """Проваливает тест, если его тело выполнило больше `budget` запросов.
+
+    Запросы фикстур не учитываются: они выполняются до вызова теста.
+    """
+    def decorator(test):
+        @functools.wraps(test)
+        def wrapper(*args, **kwargs):
+            with CaptureQueriesContext(connection) as captured:
+                result = test(*args, **kwargs)
+            statements = "\n".join(query["sql"] for query in captured)
+            assert len(captured) <= budget, (
+                f"Убедитесь, что `{test.__name__}` укладывается в"
+                f" {budget} SQL-запросов; выполнено {len(captured)}:\n"
+                f"{statements}"
+            )
+            return result
+        return wrapper
+    return decorator
+
+
 @pytest.fixture(scope="session", autouse=True)
 def cleanup(request):
     start_time = time.time()
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE, query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def api_posts(mixer: Mixer, user, published_category, published_location):
+    now = timezone.now()
+    return mixer.cycle(N_PER_PAGE + 3).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        location=published_location,
+        is_published=True,
+        pub_date=(now - timedelta(hours=i) for i in range(N_PER_PAGE + 3)),
+    )
+
+
+def _walk(client, url):
+    ids = []
+    params = {}
+    while True:
+        data = client.get(url, params).json()
+        ids.extend(post["id"] for post in data["results"])
+        if not data["next"]:
+            return ids
+        params = {"cursor": data["next"]}
+
+
+def test_api_index(client, api_posts, future_posts):
+    response = client.get("/api/v1/posts/")
+    assert response["Content-Type"] == "application/json"
+    data = response.json()
+    first = data["results"][0]
+    newest = max(api_posts, key=lambda post: post.pub_date)
+    assert first["id"] == newest.id and first["author"] == (
+        newest.author.username
+    )
+    assert first["category"]["slug"] == newest.category.slug
+    assert first["location"] == newest.location.name
+    assert _walk(client, "/api/v1/posts/") == [
+        post.id for post in sorted(
+            api_posts, key=lambda post: post.pub_date, reverse=True
+        )
+    ], (
+        "Убедитесь, что API ленты обходит по курсорам только опубликованные"
+        " посты, от новых к старым."
+    )
+
+
+def test_api_category_and_profile(client, api_posts, user,
+                                  published_category):
+    expected = sorted(post.id for post in api_posts)
+    assert sorted(_walk(
+        client, f"/api/v1/category/{published_category.slug}/posts/"
+    )) == expected
+    assert sorted(_walk(
+        client, f"/api/v1/profile/{user.username}/posts/"
+    )) == expected
+    assert client.get("/api/v1/category/missing/posts/").status_code == 404
+
+
+@query_budget(3)
+def test_api_detail(client, api_posts):
+    post = api_posts[0]
+    response = client.get(f"/api/v1/posts/{post.id}/")
+    data = response.json()
+    assert data["post"]["title"] == post.title
+    assert data["comments"] == [] and data["next"] is None
+
+
+def test_api_detail_hidden_and_etag(client, api_posts):
+    post = api_posts[0]
+    url = f"/api/v1/posts/{post.id}/"
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+        "Убедитесь, что API отвечает 304 на запрос с актуальным ETag."
+    )
+    post.is_published = False
+    post.save()
+    assert client.get(url).status_code == 404
+    assert client.post("/api/v1/posts/").status_code == 405
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.utils import COMMENTS_PER_PAGE
+from conftest import query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = COMMENTS_PER_PAGE * 2 + 7
+
+
+@pytest.fixture
+def long_thread(mixer: Mixer, post_with_published_location):
+    post = post_with_published_location
+    now = timezone.now()
+    # Часть комментариев с одинаковым временем: курсор опирается на id.
+    dates = (now - timedelta(minutes=i // 3) for i in range(N_COMMENTS))
+    comments = mixer.cycle(N_COMMENTS).blend(
+        "blog.Comment", post=post, created_at=dates
+    )
+    return post, sorted(comments, key=lambda c: (c.created_at, c.id))
+
+
+def test_detail_shows_first_comment_page(client, long_thread):
+    post, comments = long_thread
+    response = client.get(f"/posts/{post.id}/")
+    page = response.context["comments"]
+    assert [c.id for c in page] == [
+        c.id for c in comments[:COMMENTS_PER_PAGE]
+    ], (
+        "Убедитесь, что на странице поста выводится только первая страница"
+        " комментариев, от старых к новым."
+    )
+    assert f"/posts/{post.id}/comments/?cursor=" in response.content.decode()
+
+    response = client.get(
+        f"/posts/{post.id}/", {"comments": page.next_cursor}
+    )
+    second = response.context["comments"]
+    assert [c.id for c in second] == [
+        c.id for c in comments[COMMENTS_PER_PAGE:COMMENTS_PER_PAGE * 2]
+    ]
+    assert f"?comments={second.previous_cursor}" in (
+        response.content.decode()
+    ), (
+        "Убедитесь, что без JavaScript со следующей страницы комментариев"
+        " можно вернуться назад."
+    )
+    response = client.get(
+        f"/posts/{post.id}/", {"comments": second.previous_cursor}
+    )
+    assert [c.id for c in response.context["comments"]] == [
+        c.id for c in comments[:COMMENTS_PER_PAGE]
+    ]
+
+
+def test_comments_json_walk(client, long_thread):
+    post, comments = long_thread
+    seen = []
+    cursor = None
+    while True:
+        params = {"format": "json"}
+        if cursor:
+            params["cursor"] = cursor
+        data = client.get(f"/posts/{post.id}/comments/", params).json()
+        seen.extend(comment["id"] for comment in data["comments"])
+        cursor = data["next"]
+        if not cursor:
+            break
+    assert seen == [c.id for c in comments], (
+        "Убедитесь, что обход комментариев по курсору возвращает все"
+        " комментарии без пропусков и повторов."
+    )
+
+
+@query_budget(3)
+def test_comments_fragment_budget(client, long_thread):
+    post, comments = long_thread
+    response = client.get(f"/posts/{post.id}/comments/")
+    content = response.content.decode()
+    assert f"comment_{comments[0].id}" in content
+    assert "<html" not in content, (
+        "Убедитесь, что эндпоинт комментариев отдаёт фрагмент HTML."
+    )
+
+
+def test_comments_of_hidden_post(client, long_thread):
+    post, _ = long_thread
+    post.is_published = False
+    post.save()
+    response = client.get(f"/posts/{post.id}/comments/")
+    assert response.status_code == 404
+
+
+def test_comment_cursor_past_deleted_comments(client, long_thread):
+    post, comments = long_thread
+    page = client.get(f"/posts/{post.id}/").context["comments"]
+    post.comments.exclude(id__in=[c.id for c in page]).delete()
+    response = client.get(
+        f"/posts/{post.id}/", {"comments": page.next_cursor}
+    )
+    assert response.status_code == 200
+    assert len(response.context["comments"]) == len(page)
@@ -0,0 +1,73 @@
+from datetime import timedelta
+from http import HTTPStatus
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.mark.parametrize("url_template", [
+    "/",
+    "/posts/{post.id}/",
+    "/category/{post.category.slug}/",
+    "/profile/{post.author.username}/",
+])
+def test_conditional_get(
+        mixer: Mixer, client, post_with_published_location, url_template
+):
+    post = post_with_published_location
+    url = url_template.format(post=post)
+
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK
+    etag = response.get("ETag")
+    assert etag and response.get("Last-Modified"), (
+        f"Убедитесь, что страница `{url_template}` отдаёт заголовки ETag и"
+        " Last-Modified."
+    )
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        f"Убедитесь, что страница `{url_template}` отвечает 304, если"
+        " содержимое не менялось."
+    )
+
+    mixer.blend("blog.Comment", post=post)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK, (
+        f"Убедитесь, что после нового комментария страница `{url_template}`"
+        " отдаётся заново."
+    )
+
+
+def test_last_modified_changes_on_edit(
+        client, post_with_published_location
+):
+    post = post_with_published_location
+    last_modified = client.get("/")["Last-Modified"]
+
+    post.title = "Новый заголовок"
+    with mock.patch(
+        "django.utils.timezone.now",
+        return_value=timezone.now() + timedelta(seconds=2),
+    ):
+        post.save()
+        response = client.get("/", HTTP_IF_MODIFIED_SINCE=last_modified)
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что правка поста меняет Last-Modified."
+    )
+
+
+def test_cached_page_hit_without_queries(
+        client, post_with_published_location, django_assert_num_queries
+):
+    client.get("/")
+    with django_assert_num_queries(0):
+        response = client.get("/")
+    assert response.status_code == HTTPStatus.OK, (
+        "Убедитесь, что закешированная страница отдаётся без запросов к"
+        " базе, включая проверку ETag."
+    )
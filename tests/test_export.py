@@ -0,0 +1,103 @@
+import csv
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import Mixer
+
+from blog.models import Category, Comment, Location, Post
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _read_jsonl(path):
+    with gzip.open(path, "rt", encoding="utf-8") as fp:
+        return [json.loads(line) for line in fp]
+
+
+def test_export_is_incremental(
+        tmp_path, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    state = tmp_path / "state.json"
+    first = tmp_path / "first"
+
+    call_command(
+        "blog_export", str(first), state=str(state), chunk_size=1,
+        stdout=StringIO(),
+    )
+    (post_file,) = first.glob("blog_post.*.jsonl.gz")
+    (comment_file,) = first.glob("blog_comment.*.jsonl.gz")
+    records = _read_jsonl(post_file)
+    assert [r["pk"] for r in records] == [post.pk], (
+        "Убедитесь, что `blog_export` выгружает публикации в формате"
+        " JSONL, сжатом gzip."
+    )
+    assert records[0]["fields"]["title"] == post.title
+    assert records[0]["fields"]["author"] == [post.author.username], (
+        "Убедитесь, что автор выгружается естественным ключом."
+    )
+    assert len(_read_jsonl(comment_file)) == 2
+
+    mixer.blend("blog.Comment", post=post)
+    second = tmp_path / "second"
+    call_command(
+        "blog_export", str(second), state=str(state), stdout=StringIO()
+    )
+    (comment_file,) = second.glob("blog_comment.*.jsonl.gz")
+    (post_file,) = second.glob("blog_post.*.jsonl.gz")
+    assert len(_read_jsonl(comment_file)) == 1, (
+        "Убедитесь, что повторная выгрузка с файлом состояния содержит только"
+        " строки, созданные после предыдущей выгрузки."
+    )
+    assert _read_jsonl(post_file) == []
+
+
+def test_export_csv(tmp_path, post_with_published_location):
+    call_command(
+        "blog_export", str(tmp_path), format="csv", stdout=StringIO()
+    )
+    (post_file,) = tmp_path.glob("blog_post.*.csv.gz")
+    with gzip.open(post_file, "rt", encoding="utf-8", newline="") as fp:
+        rows = list(csv.DictReader(fp))
+    assert len(rows) == 1 and rows[0]["title"] == (
+        post_with_published_location.title
+    ), "Убедитесь, что `blog_export --format csv` выгружает строки в CSV."
+    assert "author_id" in rows[0]
+
+
+def test_export_round_trip(
+        tmp_path, mixer: Mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend("blog.Comment", post=post)
+    call_command("blog_export", str(tmp_path), stdout=StringIO())
+    for model in (Comment, Post, Category, Location):
+        model.objects.all().delete()
+
+    call_command(
+        "blog_import", *map(str, tmp_path.glob("*.jsonl.gz")),
+        stdout=StringIO(),
+    )
+    imported = Post.objects.select_related(
+        "author", "category", "location"
+    ).get()
+    assert (imported.title, imported.author, imported.category.slug,
+            imported.location.name) == (
+        post.title, post.author, post.category.slug, post.location.name
+    ), "Убедитесь, что файлы `blog_export` загружаются командой `blog_import`."
+    assert imported.comments.count() == 2
+
+
+def test_repeated_export_keeps_files(tmp_path, post_with_published_location):
+    for _ in range(2):
+        call_command("blog_export", str(tmp_path), stdout=StringIO())
+    post_files = list(tmp_path.glob("blog_post.*.jsonl.gz"))
+    assert len(post_files) == 2, (
+        "Убедитесь, что повторная выгрузка в тот же каталог не перезаписывает"
+        " файлы предыдущей."
+    )
+    assert all(_read_jsonl(path) for path in post_files)
@@ -0,0 +1,115 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def feeds_root(settings, tmp_path):
+    settings.BLOG_FEEDS_ROOT = tmp_path / "feeds"
+    return settings.BLOG_FEEDS_ROOT
+
+
+def test_feed_is_prerendered(
+        client, post_with_published_location, feeds_root,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    response = client.get("/feeds/rss/")
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("application/rss+xml")
+    assert post.title in response.content.decode()
+    assert (feeds_root / "all" / "rss.feed").exists()
+
+    with django_assert_num_queries(0):
+        cached = client.get("/feeds/rss/")
+    assert cached.content == response.content, (
+        "Убедитесь, что повторный запрос ленты отдаёт готовый файл без"
+        " обращений к базе."
+    )
+    assert client.get(
+        "/feeds/rss/", HTTP_IF_NONE_MATCH=cached["ETag"]
+    ).status_code == 304
+
+
+def test_feed_regenerated_on_post_save(client, post_with_published_location):
+    post = post_with_published_location
+    client.get(f"/feeds/category/{post.category.slug}/atom/")
+    client.get(f"/feeds/author/{post.author.username}/rss/")
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+
+    for url in (
+        f"/feeds/category/{post.category.slug}/atom/",
+        f"/feeds/author/{post.author.username}/rss/",
+        "/feeds/atom/",
+    ):
+        assert "Обновлённый заголовок" in client.get(url).content.decode(), (
+            "Убедитесь, что ленты, в которые входит пост, перестраиваются"
+            " после его сохранения."
+        )
+
+
+def test_feed_expires_at_next_pub_date(
+        client, mixer: Mixer, user, published_category
+):
+    now = timezone.now()
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(hours=1),
+    )
+    assert post.title not in client.get("/feeds/rss/").content.decode()
+
+    with mock.patch(
+        "django.utils.timezone.now", return_value=now + timedelta(hours=2)
+    ):
+        content = client.get("/feeds/rss/").content.decode()
+    assert post.title in content, (
+        "Убедитесь, что лента перестраивается, когда наступает дата"
+        " отложенной публикации."
+    )
+
+
+def test_feed_not_found(client, published_category):
+    assert client.get("/feeds/json/").status_code == 404
+    assert client.get("/feeds/category/missing/rss/").status_code == 404
+
+
+def test_feed_links_use_site_url(
+        client, settings, post_with_published_location
+):
+    settings.BLOG_SITE_URL = "https://blog.example"
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, "other.example"]
+    client.get("/feeds/atom/", HTTP_HOST="other.example")
+    content = client.get("/feeds/atom/").content.decode()
+    assert (
+        f"https://blog.example/posts/{post_with_published_location.id}/"
+        in content
+    ) and "other.example" not in content, (
+        "Убедитесь, что ссылки в ленте строятся от BLOG_SITE_URL, а не от"
+        " адреса первого запроса."
+    )
+
+
+def test_feed_invalidated_after_commit(
+        client, post_with_published_location, feeds_root,
+        django_capture_on_commit_callbacks,
+):
+    post = post_with_published_location
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        post.title = "Заголовок до фиксации"
+        post.save()
+        # Лента, собранная другим запросом до фиксации транзакции.
+        client.get("/feeds/rss/")
+    assert (feeds_root / "all" / "rss.feed").exists()
+    for callback in callbacks:
+        callback()
+    assert not (feeds_root / "all" / "rss.feed").exists(), (
+        "Убедитесь, что файлы лент удаляются ещё раз после фиксации"
+        " транзакции."
+    )
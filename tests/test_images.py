@@ -0,0 +1,101 @@
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.template import Context, Template
+from django.test import override_settings
+from PIL import Image
+
+from blog.images import THUMBNAIL_WIDTHS, available_formats
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _upload(width, height):
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), color=(73, 109, 137)).save(
+        buffer, format="JPEG"
+    )
+    return SimpleUploadedFile(
+        "big.jpg", buffer.getvalue(), content_type="image/jpeg"
+    )
+
+
+def test_post_image_derivatives(
+        client, user_client, published_category, tmp_path
+):
+    with override_settings(MEDIA_ROOT=tmp_path):
+        response = user_client.post("/posts/create/", {
+            "title": "Пост с большой картинкой",
+            "text": "Текст",
+            "pub_date": "2020-01-01 10:00",
+            "category": published_category.id,
+            "is_published": True,
+            "image": _upload(1500, 1000),
+        })
+        assert response.status_code == 302
+        assert len(list((tmp_path / "post_images").iterdir())) == 1, (
+            "Убедитесь, что уменьшенные копии не создаются в обработчике"
+            " запроса, а ставятся в очередь."
+        )
+
+        assert "640w" not in client.get("/").content.decode()
+        call_command(
+            "run_image_workers", "--once", "--workers", "1", stdout=StringIO()
+        )
+
+        created = sorted(p.name for p in (tmp_path / "post_images").iterdir())
+        expected_n = 1 + len(THUMBNAIL_WIDTHS) * len(available_formats())
+        assert len(created) == expected_n, (
+            "Убедитесь, что при загрузке изображения поста рядом с оригиналом"
+            " создаются уменьшенные копии во всех доступных форматах."
+        )
+        with Image.open(tmp_path / "post_images" / "big.320w.jpg") as thumb:
+            assert thumb.size == (320, 213)
+
+        from blog.models import ImageJob, Post
+
+        assert ImageJob.objects.get().status == ImageJob.DONE
+        post = Post.objects.get(title="Пост с большой картинкой")
+        html = Template(
+            "{% load blog_tags %}{% responsive_image post.image %}"
+        ).render(Context({"post": post}))
+        assert "big.640w.webp 640w" in html, (
+            "Убедитесь, что тег `responsive_image` выводит srcset с"
+            " уменьшенными копиями."
+        )
+        assert html.count("<img") == 1
+        assert "640w" in client.get("/").content.decode(), (
+            "Убедитесь, что после обработки изображения закешированные"
+            " карточки и страницы поста сбрасываются."
+        )
+
+
+def test_derivatives_read_without_storage(
+        post_with_published_location, monkeypatch
+):
+    from blog import images
+    from blog.jobs import enqueue_derivatives, finish_job
+
+    post = post_with_published_location
+    post.image.name = "post_images/photo.jpg"
+    post.save()
+    job = enqueue_derivatives(post)
+    finish_job(job.pk, derivatives={"webp": [320, 640], "jpg": [320, 640]})
+    post.refresh_from_db()
+
+    def no_exists(name):
+        raise AssertionError(name)
+
+    monkeypatch.setattr(images.default_storage, "exists", no_exists)
+    derivatives = images.get_derivatives(post.image)
+    assert [width for _, width in derivatives["webp"]] == [320, 640], (
+        "Убедитесь, что список копий берётся из записи обработчика очереди,"
+        " а не из проверок файлов в хранилище."
+    )
+
+    post.image.name = "post_images/other.jpg"
+    assert images.get_derivatives(post.image) == {}, (
+        "Убедитесь, что после замены изображения старые копии не выводятся."
+    )
@@ -0,0 +1,100 @@
+import gzip
+import json
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from blog.models import Category, Comment, Location, Post
+from blog.search import search_post_ids
+
+pytestmark = [pytest.mark.django_db]
+
+DUMP_PATH = Path(__file__).resolve().parent.parent / "db.json"
+
+
+def test_import_json_dump():
+    call_command(
+        "blog_import", str(DUMP_PATH), batch_size=7, stdout=StringIO()
+    )
+
+    records = json.loads(DUMP_PATH.read_text(encoding="utf-8"))
+    expected = {
+        label: sum(1 for record in records if record["model"] == label)
+        for label in ("auth.user", "blog.category", "blog.location",
+                      "blog.post")
+    }
+    assert get_user_model().objects.count() == expected["auth.user"]
+    assert Category.objects.count() == expected["blog.category"]
+    assert Location.objects.count() == expected["blog.location"]
+    assert Post.objects.count() == expected["blog.post"], (
+        "Убедитесь, что команда `blog_import` загружает все публикации,"
+        " даже если пользователи идут в дампе после публикаций."
+    )
+
+    source = next(r for r in records if r["model"] == "blog.post")
+    usernames = {
+        r["pk"]: r["fields"]["username"]
+        for r in records if r["model"] == "auth.user"
+    }
+    post = Post.objects.select_related("author").get(
+        title=source["fields"]["title"],
+        text=source["fields"]["text"],
+    )
+    assert post.author.username == usernames[source["fields"]["author"]], (
+        "Убедитесь, что при импорте связи переносятся по новым id."
+    )
+    assert post.created_at.isoformat().startswith(
+        source["fields"]["created_at"][:19]
+    ), "Убедитесь, что при импорте сохраняется исходное `created_at`."
+
+
+def test_import_jsonl_with_comments(tmp_path, user, published_category):
+    records = [
+        # Комментарий ссылается на публикацию, которая идёт дальше по файлу.
+        {"model": "blog.comment", "pk": 1, "fields": {
+            "text": "Первый", "post": 10, "author": 5,
+            "created_at": "2023-01-01T10:00:00Z",
+        }},
+        {"model": "blog.post", "pk": 10, "fields": {
+            "title": "Импортированный пост", "text": "Текст",
+            "pub_date": "2023-01-01T09:00:00Z", "author": 5,
+            "category": 3, "location": None, "is_published": True,
+            "created_at": "2023-01-01T09:00:00Z",
+        }},
+        {"model": "blog.category", "pk": 3, "fields": {
+            "title": "Другое название", "slug": published_category.slug,
+            "description": "", "is_published": True,
+            "created_at": "2023-01-01T08:00:00Z",
+        }},
+        {"model": "auth.user", "pk": 5, "fields": {
+            "username": user.username, "password": "",
+        }},
+        {"model": "blog.comment", "pk": 2, "fields": {
+            "text": "Без поста", "post": 999, "author": 5,
+            "created_at": "2023-01-01T11:00:00Z",
+        }},
+    ]
+    path = tmp_path / "dump.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as fp:
+        for record in records:
+            fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    call_command("blog_import", str(path), stdout=StringIO())
+
+    post = Post.objects.get(title="Импортированный пост")
+    assert post.author == user and post.category == published_category, (
+        "Убедитесь, что существующие пользователи и категории сопоставляются"
+        " по `username` и `slug`, а не дублируются."
+    )
+    assert list(Comment.objects.values_list("text", flat=True)) == [
+        "Первый"
+    ]
+    assert post.comment_count == 1, (
+        "Убедитесь, что после импорта пересчитывается `comment_count`."
+    )
+    assert search_post_ids("импортированный") == [post.pk], (
+        "Убедитесь, что после импорта перестраивается поисковый индекс."
+    )
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from blog.cache import PAGE_CACHE_HEADER, page_cache_stats, page_cache_timeout
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_anonymous_page_cache(
+        client, user_client, post_with_published_location
+):
+    stats_before = page_cache_stats()
+    url = f"/category/{post_with_published_location.category.slug}/"
+
+    assert client.get(url)[PAGE_CACHE_HEADER] == "MISS"
+    cached = client.get(url)
+    assert cached[PAGE_CACHE_HEADER] == "HIT", (
+        "Убедитесь, что повторный анонимный запрос страницы категории"
+        " обслуживается из кеша."
+    )
+    assert post_with_published_location.title in cached.content.decode()
+    assert user_client.get(url)[PAGE_CACHE_HEADER] == "BYPASS", (
+        "Убедитесь, что авторизованные пользователи обходят кеш страниц."
+    )
+
+    post_with_published_location.title = "Новый заголовок"
+    post_with_published_location.save()
+    response = client.get(url)
+    assert response[PAGE_CACHE_HEADER] == "MISS", (
+        "Убедитесь, что изменение поста сбрасывает кеш страниц."
+    )
+    assert "Новый заголовок" in response.content.decode()
+
+    stats = page_cache_stats()
+    assert stats["hits"] - stats_before["hits"] == 1
+    assert stats["misses"] - stats_before["misses"] == 2
+
+
+def test_page_cache_timeout_respects_deferred_posts(
+        mixer: Mixer, user, published_category
+):
+    mixer.blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        pub_date=timezone.now() + timedelta(seconds=30),
+    )
+    assert 0 < page_cache_timeout() <= 30, (
+        "Убедитесь, что кеш страницы живёт не дольше, чем до ближайшей"
+        " отложенной публикации."
+    )
@@ -0,0 +1,147 @@
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from mixer.backend.django import Mixer
+
+from conftest import N_PER_PAGE
+
+pytestmark = [pytest.mark.django_db]
+
+
+def raw_cursor(*payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+@pytest.fixture
+def feed_posts(mixer: Mixer, user, published_category):
+    now = timezone.now()
+    # Половина постов делит одно время публикации, чтобы проверить
+    # устойчивость курсора к совпадающим значениям `pub_date`.
+    dates = (
+        now - timedelta(hours=i if i % 2 else 1)
+        for i in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=dates,
+    )
+
+
+def _walk_forward(client, url):
+    page_obj = client.get(url).context["page_obj"]
+    pages = [page_obj]
+    while page_obj.has_next():
+        page_obj = client.get(
+            url, {"cursor": page_obj.next_cursor}
+        ).context["page_obj"]
+        pages.append(page_obj)
+    return pages
+
+
+def test_keyset_pages_cover_feed(user_client, feed_posts):
+    pages = _walk_forward(user_client, "/")
+    seen = [post.id for page in pages for post in page]
+    expected = [
+        post.id for post in sorted(
+            feed_posts, key=lambda p: (p.pub_date, p.id), reverse=True
+        )
+    ]
+    assert seen == expected, (
+        "Убедитесь, что переход по курсорам «вперёд» обходит всю ленту без"
+        " пропусков и повторов, в порядке «от новых к старым»."
+    )
+    assert [page.number for page in pages] == [1, 2, 3]
+    assert pages[0].paginator.num_pages == 3
+
+
+def test_keyset_previous_and_last(user_client, feed_posts):
+    first, second, third = _walk_forward(user_client, "/")
+
+    back = user_client.get(
+        "/", {"cursor": third.previous_cursor}
+    ).context["page_obj"]
+    assert [p.id for p in back] == [p.id for p in second], (
+        "Убедитесь, что курсор «назад» возвращает предыдущую страницу."
+    )
+
+    back = user_client.get(
+        "/", {"cursor": second.previous_cursor}
+    ).context["page_obj"]
+    assert [p.id for p in back] == [p.id for p in first]
+    assert not back.has_previous()
+
+    last = user_client.get(
+        "/", {"cursor": first.last_cursor}
+    ).context["page_obj"]
+    assert [p.id for p in last] == [p.id for p in third], (
+        "Убедитесь, что ссылка «Последняя» ведёт на последнюю страницу."
+    )
+    assert not last.has_next()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    raw_cursor("n", 1, 5),
+    raw_cursor("n", "x", ["2020-01-01T00:00:00+00:00", "1"]),
+    raw_cursor("n", 1, [{}, 1]),
+    raw_cursor("n", 1, ["не дата", "1"]),
+    raw_cursor("n", 1, ["1"]),
+    raw_cursor("n", 1),
+    raw_cursor("n", 1, ["2020-01-01T00:00:00+00:00",
+                        "99999999999999999999999"]),
+    raw_cursor("n", 1, ["2020-01-01T00:00:00+00:00", 1e300]),
+])
+def test_invalid_cursor_falls_back_to_first_page(
+        user_client, feed_posts, cursor
+):
+    response = user_client.get("/", {"cursor": cursor})
+    page_obj = response.context["page_obj"]
+    assert page_obj.number == 1 and len(page_obj) == N_PER_PAGE, (
+        "Убедитесь, что при некорректном курсоре отображается первая"
+        " страница ленты."
+    )
+
+
+@pytest.mark.parametrize("url, page_key", [
+    ("/", None),
+    ("/api/v1/posts/", "next"),
+])
+def test_cursor_past_deleted_rows(user_client, feed_posts, url, page_key):
+    from blog.models import Post
+
+    response = user_client.get(url)
+    if page_key:
+        cursor = response.json()[page_key]
+        shown = [post["id"] for post in response.json()["results"]]
+    else:
+        cursor = response.context["page_obj"].next_cursor
+        shown = [post.id for post in response.context["page_obj"]]
+    Post.objects.exclude(id__in=shown).delete()
+
+    response = user_client.get(url, {"cursor": cursor})
+    assert response.status_code == 200, (
+        "Убедитесь, что курсор, за которым записи удалены, открывает"
+        " последнюю страницу, а не приводит к ошибке."
+    )
+
+
+@pytest.mark.parametrize("url", ("/", "/api/v1/posts/"))
+def test_hydrate_query_unordered(user_client, feed_posts, url):
+    with CaptureQueriesContext(connection) as queries:
+        user_client.get(url)
+    hydrate = [
+        query["sql"] for query in queries
+        if '"blog_post"."id" IN (' in query["sql"]
+    ]
+    assert hydrate and not any("ORDER BY" in sql for sql in hydrate), (
+        "Убедитесь, что второй шаг загрузки ленты не сортирует строки:"
+        " порядок страницы уже задан списком id."
+    )
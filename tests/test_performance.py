@@ -0,0 +1,64 @@
+import json
+import logging
+
+import pytest
+from django.db import connection
+from django.test import override_settings
+
+from blog.models import Post
+from blog.performance import RequestMetrics
+
+pytestmark = [pytest.mark.django_db]
+
+
+def _records(caplog, event):
+    return [
+        json.loads(record.getMessage())
+        for record in caplog.records
+        if record.name == "blog.performance"
+        and json.loads(record.getMessage())["event"] == event
+    ]
+
+
+@override_settings(BLOG_SERVER_TIMING=True)
+def test_server_timing_and_request_log(
+        client, post_with_published_location, caplog
+):
+    post = post_with_published_location
+    with caplog.at_level(logging.INFO, logger="blog.performance"):
+        response = client.get(f"/posts/{post.id}/")
+
+    header = response.headers.get("Server-Timing", "")
+    for metric in ("db;dur=", "tpl;dur=", "view;dur=", "total;dur="):
+        assert metric in header, (
+            "Убедитесь, что ответ содержит заголовок `Server-Timing` со"
+            " временем SQL, шаблонов и кода представления."
+        )
+    (line,) = _records(caplog, "request")
+    assert line["view"] == "blog:post_detail"
+    assert line["queries"] > 0 and line["status"] == 200
+
+
+@override_settings(BLOG_SERVER_TIMING=False)
+def test_server_timing_disabled(client):
+    assert "Server-Timing" not in client.get("/").headers
+
+
+def test_repeated_queries_are_flagged(
+        many_posts_with_published_locations
+):
+    metrics = RequestMetrics()
+    with connection.execute_wrapper(metrics):
+        for post in Post.objects.all():
+            Post.objects.get(pk=post.pk)
+        list(Post.objects.filter(pk__in=[1, 2, 3]))
+        list(Post.objects.filter(pk__in=[4, 5]))
+
+    statements = dict(metrics.repeated(threshold=2))
+    assert len(statements) == 2, (
+        "Убедитесь, что одинаковые с точностью до параметров запросы"
+        " группируются, в том числе списки `IN (...)` разной длины."
+    )
+    assert sorted(statements.values()) == [
+        2, len(many_posts_with_published_locations)
+    ]
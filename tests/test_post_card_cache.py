@@ -0,0 +1,75 @@
+import pytest
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+POST_CARD_TEMPLATE = "includes/post_card.html"
+
+
+def _card_renders(response):
+    return [
+        t.name for t in response.templates if t.name == POST_CARD_TEMPLATE
+    ]
+
+
+def _check_card_cache(client, post):
+    assert _card_renders(client.get("/")), (
+        "Убедитесь, что карточка поста отрисовывается при первом запросе."
+    )
+    assert not _card_renders(client.get("/")), (
+        "Убедитесь, что повторный запрос ленты берёт карточку поста из кеша."
+    )
+
+    post.title = "Обновлённый заголовок"
+    post.save()
+    response = client.get("/")
+    assert _card_renders(response), (
+        "Убедитесь, что изменение поста сбрасывает кеш его карточки."
+    )
+    assert "Обновлённый заголовок" in response.content.decode("utf-8")
+
+    post.category.title = "Новая категория"
+    post.category.save()
+    response = client.get("/")
+    assert "Новая категория" in response.content.decode("utf-8"), (
+        "Убедитесь, что изменение категории сбрасывает кеш карточек её"
+        " постов."
+    )
+
+
+def test_post_card_cache_locmem(user_client, post_with_published_location):
+    _check_card_cache(user_client, post_with_published_location)
+
+
+def test_post_card_cache_files(
+        user_client, post_with_published_location, tmp_path
+):
+    caches = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+        "files": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": str(tmp_path),
+        },
+    }
+    with override_settings(CACHES=caches, BLOG_FRAGMENT_CACHE="files"):
+        _check_card_cache(user_client, post_with_published_location)
+
+
+def test_version_bumped_after_commit(
+        client, post_with_published_location,
+        django_capture_on_commit_callbacks,
+):
+    post = post_with_published_location
+    client.get("/")
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        post.title = "Заголовок до фиксации"
+        post.save()
+    client.get("/")
+    for callback in callbacks:
+        callback()
+    assert _card_renders(client.get("/")), (
+        "Убедитесь, что метка версии поста меняется ещё раз после фиксации"
+        " транзакции: карточку могли закешировать до неё."
+    )
@@ -0,0 +1,81 @@
+import gzip
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.http import HttpRequest
+
+from pages.views import csrf_failure
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def prerendered(settings, tmp_path):
+    settings.PAGES_PRERENDER_ROOT = tmp_path
+    settings.PAGES_SERVE_PRERENDERED = True
+    call_command("prerender_pages", stdout=StringIO())
+    return tmp_path
+
+
+def test_static_page_served_from_file(client, prerendered):
+    rendered = (prerendered / "about.html").read_bytes()
+    response = client.get("/pages/about/")
+    assert response.status_code == 200
+    assert response.content == rendered, (
+        "Убедитесь, что анонимным посетителям страница «О проекте» отдаётся"
+        " из заранее отрисованного файла."
+    )
+    assert "Войти" in rendered.decode()
+
+    response = client.get("/pages/rules/", HTTP_ACCEPT_ENCODING="gzip, br")
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.content) == (
+        prerendered / "rules.html"
+    ).read_bytes()
+    assert "Accept-Encoding" in response["Vary"]
+
+
+@pytest.mark.parametrize("accept_encoding", [
+    "gzip;q=0", "br, gzip; q=0.0", "*;q=0", "gzip;q=0, *",
+])
+def test_refused_gzip_not_served(client, prerendered, accept_encoding):
+    response = client.get(
+        "/pages/rules/", HTTP_ACCEPT_ENCODING=accept_encoding
+    )
+    assert not response.has_header("Content-Encoding"), (
+        "Убедитесь, что gzip не отдаётся клиентам, которые от него"
+        " отказались через q=0."
+    )
+    assert response.content == (prerendered / "rules.html").read_bytes()
+
+
+def test_404_splices_request_url(client, prerendered):
+    url = "/missing/<script>/"
+    plain = client.get(url)
+    assert plain.status_code == 404
+    content = plain.content.decode()
+    assert "http://testserver/missing/%3Cscript%3E/" in content, (
+        "Убедитесь, что в заранее отрисованную страницу 404 подставляется"
+        " адрес запроса."
+    )
+
+    compressed = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert compressed["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.content).decode() == content
+
+
+def test_authenticated_users_get_rendered_pages(user_client, user,
+                                                prerendered):
+    response = user_client.get("/pages/about/")
+    assert user.username in response.content.decode(), (
+        "Убедитесь, что авторизованным пользователям страница рендерится"
+        " с их шапкой."
+    )
+    assert "Content-Encoding" not in response
+
+
+def test_csrf_failure_without_user(prerendered):
+    response = csrf_failure(HttpRequest())
+    assert response.status_code == 403
+    assert response.content == (prerendered / "403csrf.html").read_bytes()
@@ -0,0 +1,37 @@
+import pytest
+from mixer.backend.django import Mixer
+
+from conftest import query_budget
+
+pytestmark = [pytest.mark.django_db]
+
+N_COMMENTS = 30
+
+
+@pytest.fixture
+def commented_post(mixer: Mixer, post_with_published_location, another_user):
+    post = post_with_published_location
+    mixer.cycle(N_COMMENTS).blend(
+        "blog.Comment", post=post, author=mixer.sequence(
+            post.author, another_user, *mixer.cycle(3).blend(
+                "auth.User"
+            )
+        ),
+    )
+    return post
+
+
+# Ближайшая отложенная публикация (первый запрос после правки), пост со
+# связями, комментарии с авторами.
+@query_budget(3)
+def test_post_detail_anonymous_budget(client, commented_post):
+    response = client.get(f"/posts/{commented_post.id}/")
+    assert len(response.context["comments"]) == N_COMMENTS
+
+
+# Плюс сессия и пользователь.
+@query_budget(5)
+def test_post_detail_author_budget(user_client, commented_post):
+    response = user_client.get(f"/posts/{commented_post.id}/")
+    assert response.status_code == 200
+    assert "Удалить комментарий" in response.content.decode()
@@ -0,0 +1,184 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.models import Session
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from blog.cache import (cache_anonymous_page, invalidate_all,
+                        mark_replica_synced)
+from blog.conditional import condition_on_content
+from blog.models import Post
+from blog.replicas import (PIN_COOKIE, ReplicaMiddleware, ReplicaRouter,
+                           replica_reads)
+
+
+@replica_reads
+def read_view(request):
+    return HttpResponse(ReplicaRouter().db_for_read(Post) or "default")
+
+
+def write_view(request):
+    return HttpResponse(ReplicaRouter().db_for_read(Post) or "default")
+
+
+def call(request, view):
+    def get_response(request):
+        middleware.process_view(request, view, (), {})
+        return view(request)
+
+    middleware = ReplicaMiddleware(get_response)
+    return middleware(request)
+
+
+@pytest.fixture
+def replicas(settings):
+    settings.BLOG_REPLICA_DATABASES = ["replica"]
+    invalidate_all()
+
+
+@pytest.mark.usefixtures("replicas")
+@pytest.mark.parametrize("method, view, cookies, expected", (
+    ("get", read_view, {}, b"replica"),
+    ("head", read_view, {}, b"replica"),
+    ("get", write_view, {}, b"default"),
+    ("post", read_view, {}, b"default"),
+    ("get", read_view, {PIN_COOKIE: "1"}, b"default"),
+))
+def test_read_routing(method, view, cookies, expected):
+    request = getattr(RequestFactory(), method)("/")
+    request.COOKIES.update(cookies)
+    assert call(request, view).content == expected, (
+        "Убедитесь, что на реплику уходит только чтение помеченных"
+        " представлений и только без закрепления за основной базой."
+    )
+
+
+def anonymous_get(path):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return request
+
+
+def test_no_replicas_configured():
+    assert call(RequestFactory().get("/"), read_view).content == b"default"
+
+
+@pytest.mark.usefixtures("replicas")
+def test_write_pins_to_primary(settings):
+    settings.BLOG_REPLICA_PIN_SECONDS = 30
+    response = call(RequestFactory().post("/"), write_view)
+    assert response.cookies[PIN_COOKIE]["max-age"] == 30, (
+        "Убедитесь, что после записи браузер читает с основной базы."
+    )
+    assert PIN_COOKIE not in call(RequestFactory().get("/"), read_view).cookies
+
+
+def test_router_outside_request():
+    router = ReplicaRouter()
+    assert router.db_for_read(Post) is None
+    assert router.db_for_write(Post) == "default"
+
+
+@replica_reads
+@cache_anonymous_page
+def cached_view(request):
+    return HttpResponse(ReplicaRouter().db_for_read(Post) or "default")
+
+
+cached_view_primary = cache_anonymous_page(write_view)
+
+
+@pytest.mark.usefixtures("replicas")
+def test_authenticated_users_read_primary(django_user_model):
+    request = RequestFactory().get("/")
+    request.user = django_user_model(username="author")
+    assert call(request, read_view).content == b"default", (
+        "Убедитесь, что авторизованные пользователи читают с основной базы."
+    )
+
+
+@pytest.mark.usefixtures("replicas")
+def test_auth_and_sessions_read_primary():
+    def view(request):
+        router = ReplicaRouter()
+        return HttpResponse(" ".join(
+            router.db_for_read(model)
+            for model in (get_user_model(), Session)
+        ))
+
+    response = call(RequestFactory().get("/"), replica_reads(view))
+    assert response.content == b"default default", (
+        "Убедитесь, что сессии и пользователи всегда читаются с основной"
+        " базы."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("replicas")
+def test_replica_pages_cached_per_sync():
+    mark_replica_synced("replica")
+    statuses = [
+        call(anonymous_get("/replica-page/"), cached_view)["X-Page-Cache"]
+        for _ in range(2)
+    ]
+    assert statuses == ["MISS", "HIT"], (
+        "Убедитесь, что страницы с реплики попадают в кеш страниц."
+    )
+    mark_replica_synced("replica")
+    response = call(anonymous_get("/replica-page/"), cached_view)
+    assert response["X-Page-Cache"] == "MISS", (
+        "Убедитесь, что после синхронизации реплики её страницы собираются"
+        " заново."
+    )
+
+    response = call(anonymous_get("/replica-page/"), cached_view_primary)
+    assert response["X-Page-Cache"] == "MISS", (
+        "Убедитесь, что страницы с реплики и с основной базы кешируются"
+        " под разными ключами."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("replicas")
+def test_unsynced_replica_misses_read_primary():
+    responses = [
+        call(anonymous_get("/unsynced-page/"), cached_view)
+        for _ in range(2)
+    ]
+    assert responses[0].content == b"default", (
+        "Убедитесь, что промах кеша для реплики с неизвестной"
+        " синхронизацией читается с основной базы."
+    )
+    assert responses[1]["X-Page-Cache"] == "HIT"
+
+
+@replica_reads
+@condition_on_content
+def conditional_view(request):
+    return HttpResponse(ReplicaRouter().db_for_read(Post) or "default")
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("replicas")
+def test_replica_validators_follow_sync():
+    response = call(anonymous_get("/"), conditional_view)
+    assert response.content == b"replica"
+    assert not response.has_header("ETag"), (
+        "Убедитесь, что ответ с реплики без известной синхронизации не"
+        " получает ETag из метки основной базы."
+    )
+    assert not response.has_header("Last-Modified")
+
+    mark_replica_synced("replica")
+    etag = call(anonymous_get("/"), conditional_view)["ETag"]
+    request = anonymous_get("/")
+    request.META["HTTP_IF_NONE_MATCH"] = etag
+    assert call(request, conditional_view).status_code == 304
+
+    mark_replica_synced("replica")
+    request = anonymous_get("/")
+    request.META["HTTP_IF_NONE_MATCH"] = etag
+    assert call(request, conditional_view).status_code == 200, (
+        "Убедитесь, что после синхронизации реплики ETag меняется."
+    )
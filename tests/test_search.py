@@ -0,0 +1,84 @@
+import pytest
+from mixer.backend.django import Mixer
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def searchable_posts(mixer: Mixer, user, published_category):
+    def blend(**kwargs):
+        return mixer.blend(
+            "blog.Post",
+            author=user,
+            category=published_category,
+            is_published=kwargs.pop("is_published", True),
+            **kwargs,
+        )
+
+    return {
+        "in_text": blend(title="Прогулка", text="Видели много котов во дворе."),
+        "in_title": blend(title="Кошки и коты", text="Заметки."),
+        "hidden": blend(
+            title="Коты", text="Черновик про кота.", is_published=False
+        ),
+        "other": blend(title="Обед", text="Суп и хлеб."),
+    }
+
+
+def _found_ids(client, query):
+    response = client.get("/search/", {"q": query})
+    assert response.status_code == 200, (
+        "Убедитесь, что страница поиска `/search/` доступна."
+    )
+    return [post.id for post in response.context["posts"]]
+
+
+def test_search_stems_and_ranks(client, searchable_posts):
+    found = _found_ids(client, "кот")
+    assert found == [
+        searchable_posts["in_title"].id, searchable_posts["in_text"].id
+    ], (
+        "Убедитесь, что поиск находит словоформы, не показывает"
+        " неопубликованные посты и ставит совпадения в заголовке выше."
+    )
+
+
+def test_search_index_follows_changes(client, searchable_posts):
+    post = searchable_posts["other"]
+    post.text = "Кот съел суп."
+    post.save()
+    assert post.id in _found_ids(client, "коту"), (
+        "Убедитесь, что изменённый пост переиндексируется."
+    )
+
+    post.delete()
+    assert post.id not in _found_ids(client, "кот"), (
+        "Убедитесь, что удалённый пост пропадает из поиска."
+    )
+
+
+def test_search_query_syntax_is_escaped(client, searchable_posts):
+    assert _found_ids(client, 'кот" OR NEAR(') == [], (
+        "Убедитесь, что спецсимволы в запросе не ломают поиск."
+    )
+
+
+def test_search_limit_applies_to_visible_posts(searchable_posts):
+    from blog.models import Post
+    from blog.search import search_post_ids
+    from blog.utils import filter_posts
+
+    assert search_post_ids("кот", filter_posts(Post.objects), limit=1) == [
+        searchable_posts["in_title"].id
+    ], (
+        "Убедитесь, что видимость постов проверяется в запросе к индексу,"
+        " до ограничения числа результатов."
+    )
+
+
+def test_admin_search(admin_client, searchable_posts):
+    response = admin_client.get("/admin/blog/post/", {"q": "кот"})
+    found = {post.id for post in response.context["cl"].result_list}
+    assert found == {
+        searchable_posts[name].id for name in ("in_text", "in_title", "hidden")
+    }
@@ -0,0 +1,47 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+pytestmark = [pytest.mark.django_db]
+
+SEED_OPTIONS = dict(
+    users=5, categories=3, locations=4, posts=60, future_share=0.2,
+    hot_comments=40, seed=7, batch_size=16,
+)
+
+
+def _seed():
+    call_command("blog_seed", stdout=StringIO(), **SEED_OPTIONS)
+    return list(Post.objects.order_by("pk").values_list("title", flat=True))
+
+
+def test_seed_generates_dataset():
+    _seed()
+    assert Post.objects.count() == SEED_OPTIONS["posts"]
+    assert Post.objects.filter(pub_date__gt=timezone.now()).exists(), (
+        "Убедитесь, что `blog_seed` создаёт отложенные публикации."
+    )
+    counts = Post.objects.annotate(actual=Count("comments")).values_list(
+        "comment_count", "actual"
+    )
+    assert all(stored == actual for stored, actual in counts), (
+        "Убедитесь, что после `blog_seed` счётчики комментариев"
+        " пересчитаны."
+    )
+    assert max(actual for _, actual in counts) >= SEED_OPTIONS[
+        "hot_comments"
+    ]
+    assert Comment.objects.exists()
+
+
+def test_seed_is_reproducible():
+    first = _seed()
+    Post.objects.all().delete()
+    assert _seed() == first, (
+        "Убедитесь, что `blog_seed --seed` генерирует одинаковые данные."
+    )
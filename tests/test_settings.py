@@ -0,0 +1,59 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / "locblog"
+PRINT_SETTINGS = (
+    "import django; django.setup(); from django.conf import settings;"
+    " print(settings.DEBUG, settings.BASE_DIR,"
+    " settings.DATABASES['default'].get('CONN_MAX_AGE', 0),"
+    " settings.SESSION_ENGINE, settings.STATICFILES_STORAGE,"
+    " settings.CACHES['default']['BACKEND'])"
+)
+
+
+def _run(**env):
+    environ = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith(("LOCBLOG_", "DJANGO_"))
+    }
+    environ.update(DJANGO_SETTINGS_MODULE="locblog.settings", **env)
+    return subprocess.run(
+        (sys.executable, "-c", PRINT_SETTINGS),
+        cwd=PROJECT_DIR, env=environ, capture_output=True, text=True,
+    )
+
+
+def test_dev_profile_by_default():
+    result = _run()
+    debug, base_dir, *_ = result.stdout.split()
+    assert debug == "True"
+    assert Path(base_dir) == PROJECT_DIR, (
+        "Убедитесь, что `BASE_DIR` указывает на каталог проекта."
+    )
+
+
+def test_prod_profile():
+    result = _run(LOCBLOG_PROFILE="prod", DJANGO_SECRET_KEY="secret")
+    debug, _, conn_max_age, session_engine, storage, cache = (
+        result.stdout.split()
+    )
+    assert debug == "False"
+    assert int(conn_max_age) > 0, (
+        "Убедитесь, что в профиле prod включены постоянные соединения."
+    )
+    assert session_engine.endswith("cached_db")
+    assert storage.endswith("ManifestStaticFilesStorage")
+    assert cache.endswith("PyMemcacheCache"), (
+        "Убедитесь, что в профиле prod общий кеш — memcached, а не файлы."
+    )
+
+
+def test_prod_refuses_debug():
+    result = _run(
+        LOCBLOG_PROFILE="prod", DJANGO_SECRET_KEY="secret", DJANGO_DEBUG="1"
+    )
+    assert result.returncode != 0 and "DEBUG" in result.stderr, (
+        "Убедитесь, что профиль prod не запускается с включённым DEBUG."
+    )
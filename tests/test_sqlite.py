@@ -0,0 +1,42 @@
+import pytest
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+
+from blog.sqlite import pragma_statements, read_pragmas
+
+
+@pytest.mark.django_db
+def test_pragmas_applied_on_connect(settings, tmp_path):
+    settings.BLOG_SQLITE_PRAGMAS = {
+        "busy_timeout": 1234,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+        "cache_size": None,
+    }
+    wrapper = DatabaseWrapper(
+        {**connection.settings_dict, "NAME": str(tmp_path / "db.sqlite3")},
+        alias="pragmas",
+    )
+    try:
+        wrapper.ensure_connection()
+        values = read_pragmas(wrapper, (
+            "busy_timeout", "journal_mode", "synchronous", "temp_store",
+        ))
+    finally:
+        wrapper.close()
+    assert values == {
+        "busy_timeout": 1234,
+        "journal_mode": "wal",
+        "synchronous": 1,
+        "temp_store": 2,
+    }, (
+        "Убедитесь, что PRAGMA из BLOG_SQLITE_PRAGMAS выполняются при"
+        " каждом новом соединении с SQLite."
+    )
+
+
+def test_none_disables_pragma():
+    assert pragma_statements({"cache_size": None, "synchronous": 1}) == [
+        "PRAGMA synchronous = 1"
+    ]
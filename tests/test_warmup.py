@@ -0,0 +1,58 @@
+import logging
+
+import pytest
+from django.apps import apps
+from django.template import engines
+
+from blog.warmup import warm_on_server_start, warm_templates
+
+CACHED_TEMPLATES = [{
+    "BACKEND": "django.template.backends.django.DjangoTemplates",
+    "DIRS": [],
+    "APP_DIRS": False,
+    "OPTIONS": {
+        "loaders": [
+            ("django.template.loaders.cached.Loader", [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ]),
+        ],
+        "context_processors": [],
+    },
+}]
+
+
+@pytest.fixture
+def cached_templates(settings):
+    settings.TEMPLATES = [
+        {**CACHED_TEMPLATES[0], "DIRS": settings.TEMPLATES[0]["DIRS"]}
+    ]
+    return engines.all()[0].engine.template_loaders[0]
+
+
+def test_warm_templates_fills_cached_loader(cached_templates):
+    count, _ = warm_templates()
+    cache = cached_templates.get_template_cache
+    for name in ("base.html", "blog/detail.html", "includes/post_card.html"):
+        assert name in cache, (
+            "Убедитесь, что прогрев компилирует шаблоны проекта в кеш"
+            " cached.Loader."
+        )
+    assert count == len(cache)
+
+
+def test_warmup_on_server_start(settings, cached_templates, caplog):
+    apps.get_app_config("blog").ready()
+    assert "base.html" not in cached_templates.get_template_cache, (
+        "Убедитесь, что прогрев не запускается из `ready()` и не замедляет"
+        " команды управления."
+    )
+
+    settings.BLOG_TEMPLATE_WARMUP = True
+    with caplog.at_level(logging.INFO, logger="blog.performance"):
+        warm_on_server_start()
+    assert "base.html" in cached_templates.get_template_cache
+    assert any(
+        "Скомпилировано шаблонов" in record.getMessage()
+        for record in caplog.records
+    ), "Убедитесь, что прогрев шаблонов сообщает время компиляции."